@@ -2,23 +2,143 @@
 
 Play something like the NYTimes Wordle, or help you solve it.
 """
-import sys
+import os
+import argparse
+import cProfile
+import logging
 import re
 import random
 import string
+import struct
+import gzip
+import json
+import hashlib
+import tempfile
 import time
-from collections import Counter
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property, wraps
 from enum import Enum
 try:
     from colorama import Fore, Back, Style, init
 except ModuleNotFoundError:
     print('colorama is not installed. Consider "pip install colorama" ...')
     exit()
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    print('numpy is not installed. Consider "pip install numpy" ...')
+    exit()
 
 init(autoreset=True)
 
-recalc_count = 0
-recalc_timers = [0.0] * 6
+ANSWERS_FILE = 'wordle-answers-alphabetical.txt'
+GUESSES_FILE = 'wordle-allowed-guesses.txt'
+CACHE_FILE = 'wordle-patterns.cache'
+TREE_FILE = 'wordle-tree{}.json.gz'
+
+log = logging.getLogger('wordle')
+
+def add_logging_args(parser:argparse.ArgumentParser) -> None:
+    parser.add_argument('-v', '--verbose', action='count', default=0, help='more log output, repeat for debug')
+    parser.add_argument('-q', '--quiet', action='store_true', help='only log errors')
+
+def configure_logging(args:argparse.Namespace, level:int=logging.WARNING) -> None:
+    """Log to stderr at level, moved down one step per -v, or errors only with -q."""
+    if args.quiet:
+        level = logging.ERROR
+    else:
+        level = max(logging.DEBUG, level - 10 * args.verbose)
+    logging.basicConfig(level=level, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+class Progress:
+    """Logs progress through total items at most once per interval seconds, however often update is called."""
+    def __init__(self, total:int, label:str, interval:float=2.0, logger:logging.Logger=log):
+        self.total = total
+        self.label = label
+        self.interval = interval
+        self.logger = logger
+        self.done = 0
+        self.start_time = time.monotonic()
+        self.next_time = self.start_time + interval
+
+    def update(self, n:int=1) -> None:
+        self.done += n
+        now = time.monotonic()
+        if now >= self.next_time or self.done == self.total:
+            self.next_time = now + self.interval
+            rate = self.done / max(now - self.start_time, 1e-9)
+            if self.total:
+                self.logger.info('%s: %d/%d (%.1f%%), %.1f/sec', self.label, self.done, self.total, self.done / self.total * 100.0, rate)
+            else:
+                self.logger.info('%s: %d, %.1f/sec', self.label, self.done, rate)
+
+class Metrics:
+    """Named timing spans and counters for finding where the solver spends its time.
+
+    Durations are kept per span name as a total and a histogram of power of two
+    nanosecond buckets. While disabled, spans and counters do nothing.
+    """
+    def __init__(self, enabled:bool=False):
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls = Counter()
+        self.total_ns = Counter()
+        self.histograms = defaultdict(Counter)
+        self.counters = Counter()
+
+    def record(self, name:str, ns:int) -> None:
+        self.calls[name] += 1
+        self.total_ns[name] += ns
+        self.histograms[name][ns.bit_length()] += 1
+
+    def count(self, name:str, n:int=1) -> None:
+        if self.enabled:
+            self.counters[name] += n
+
+    def percentile(self, name:str, q:float) -> float:
+        """Approximate percentile in nanoseconds, the upper edge of the histogram bucket it falls in."""
+        target = q * self.calls[name]
+        seen = 0
+        for bucket in sorted(self.histograms[name]):
+            seen += self.histograms[name][bucket]
+            if seen >= target:
+                return (float(2 ** bucket))
+        return (0.0)
+
+    def snapshot(self) -> dict:
+        return ({name: {'calls': self.calls[name], 'total_ms': self.total_ns[name] / 1e6,
+            'mean_us': self.total_ns[name] / self.calls[name] / 1e3,
+            'p50_us': self.percentile(name, 0.5) / 1e3, 'p99_us': self.percentile(name, 0.99) / 1e3}
+            for name in self.calls} | {'counters': dict(self.counters)})
+
+    def report(self) -> str:
+        lines = ['{:<20} {:>10} {:>12} {:>10} {:>10} {:>10}'.format('span', 'calls', 'total ms', 'mean us', 'p50 us', 'p99 us')]
+        for name, st in sorted(self.snapshot().items()):
+            if name != 'counters':
+                lines.append('{:<20} {calls:>10} {total_ms:>12.1f} {mean_us:>10.1f} {p50_us:>10.1f} {p99_us:>10.1f}'.format(name, **st))
+        for name, n in sorted(self.counters.items()):
+            lines.append('{:<20} {:>10}'.format(name, n))
+        return ('\n'.join(lines))
+
+metrics = Metrics()
+
+def timed(name:str):
+    """Decorator recording each call of the function as a metrics span."""
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return (func(*args, **kwargs))
+            start = time.perf_counter_ns()
+            try:
+                return (func(*args, **kwargs))
+            finally:
+                metrics.record(name, time.perf_counter_ns() - start)
+        return (wrapper)
+    return (decorate)
 
 class WCommand(Enum):
     HelpMsg = 'HelpMsg'
@@ -55,7 +175,8 @@ def wcolorize(s:str='', template:str='') -> str:
     return (res)
 
 class Guess:
-    def __init__(self):
+    def __init__(self, length:int=5):
+        self.length = length
         self.guess = None
         self.colors = None
         self.input = None
@@ -63,8 +184,8 @@ class Guess:
     
     def help_msg(self) -> None:
         print ('Commands: 1. Web-Game, 2. New Word, 3. Possibilities, 4. Recommend, 5. Auto, 6. Quit')
-        print ('Guess input must be 5 letters [A-Z].')
-        print ('Color input must be 5 colors [GYB]{5}.')
+        print (f'Guess input must be {self.length} letters [A-Z].')
+        print (f'Color input must be {self.length} colors [GYB]{{{self.length}}}.')
 
     def collect_input(self, prompt:str, count:int, colorize:bool=True) -> None:
         self.cmd  = None
@@ -102,7 +223,7 @@ class Guess:
         self.guess = None
         if inp is None:
             inp = self.input
-        if re.match('^[A-Z]{5}$', inp):
+        if len(inp) == self.length and re.match('^[A-Z]+$', inp):
             self.guess = inp
             return True
         return False
@@ -110,14 +231,15 @@ class Guess:
     def parse_colors(self, inp:str = None) -> bool:
         if inp is None:
             inp = self.input
-        if re.match('^[GYB]{5}$', inp):
+        if len(inp) == self.length and re.match('^[GYB]+$', inp):
             self.colors = inp
             return True
         return False
 
+    @timed('compute_colors')
     def compute_colors(self, guess:str, answer:str) -> None:
         answer = list(answer)
-        colors = list('-' * 5)
+        colors = list('-' * len(guess))
         for i, ch in enumerate(answer):
             if (guess[i] == ch):
                 colors[i] = 'G'
@@ -135,37 +257,61 @@ class Guess:
     def __str__(self):
         return (wcolorize(self.guess, self.colors))          
 
+ALL_LETTERS = (1 << 26) - 1
+
+def letter_bit(ch:str) -> int:
+    return (1 << (ord(ch) - ord('A')))
+
 class Descriptor:
-    def __init__(self, remaining_words):
-        self.sets = [set(string.ascii_uppercase)] * 5
-        self.min_count = Counter()
-        self.max_count = Counter(string.ascii_uppercase * 5)
-        self.remaining_words = remaining_words.copy()
+    """What is known about the answer, kept as arrays so filtering is vectorized.
+
+    masks[i] is a 26-bit set of the letters still possible at position i, and
+    min_count/max_count bound how often each letter occurs in the answer.
+    remaining holds the indices of the answers that fit, into patterns.answers.
+    """
+    def __init__(self, patterns):
+        self.patterns = patterns
+        self.masks = np.full(patterns.length, ALL_LETTERS, dtype=np.uint32)
+        self.greens = np.full(patterns.length, -1, dtype=np.int8)
+        self.min_count = np.zeros(26, dtype=np.int8)
+        self.max_count = np.full(26, patterns.length, dtype=np.int8)
+        self.remaining = np.arange(len(patterns.answers), dtype=np.intp)
         self.alpha_colors = dict(zip(string.ascii_uppercase, WColor.X.value * 26))
 
+    @property
+    def remaining_words(self):
+        answers = self.patterns.answers
+        return ([answers[i] for i in self.remaining])
+
+    @timed('copy')
     def copy(self):
-        c = Descriptor(self.remaining_words)
-        for i in range(len(c.sets)):
-            c.sets[i] = self.sets[i].copy()
+        c = Descriptor.__new__(Descriptor)
+        c.patterns = self.patterns
+        c.masks = self.masks.copy()
+        c.greens = self.greens.copy()
         c.min_count = self.min_count.copy()
         c.max_count = self.max_count.copy()
+        c.remaining = self.remaining
         c.alpha_colors = self.alpha_colors.copy()
         return (c)
 
-    def pprint(self, prefix:str=None):
-        if (prefix is not None):
-            print ('{}'.format(prefix))
-        regex = ''.join(['[' + ''.join(sorted(s)) + ']' for s in self.sets])
+    def regex(self) -> str:
+        return (''.join(['[' + ''.join(c for j, c in enumerate(string.ascii_uppercase) if m >> j & 1) + ']' for m in self.masks]))
+
+    def describe(self, prefix:str=None) -> str:
+        lines = [] if prefix is None else [prefix]
         ac = ' '.join([self.alpha_colors[c] for c in string.ascii_uppercase])
-        print ('d.regex           {}'.format(regex))
-        print ('                  {}'.format(' '.join(list(string.ascii_uppercase))))
-        print ('d.min_count       {}'.format(' '.join(f'{k}-{v}' for k,v in self.min_count.items())))
-        print ('d.max_count       {}'.format(' '.join(f'{k}-{v}' for k,v in self.max_count.items())))
-        #print ('d.min_count       {}'.format(' '.join([str(self.min_count[c]) for c in string.ascii_uppercase])))
-        #print ('d.max_count       {}'.format(' '.join([str(self.max_count[c]) for c in string.ascii_uppercase])))
-        print ('d.alpha_colors    {}'.format(wcolorize(' '.join(list(string.ascii_uppercase)), ac)))
-        print ('d.remaining_words {} words'.format(len(self.remaining_words)))
-        
+        lines.append('d.regex           {}'.format(self.regex()))
+        lines.append('                  {}'.format(' '.join(list(string.ascii_uppercase))))
+        lines.append('d.min_count       {}'.format(' '.join(f'{k}-{v}' for k,v in zip(string.ascii_uppercase, self.min_count) if v > 0)))
+        lines.append('d.max_count       {}'.format(' '.join(f'{k}-{v}' for k,v in zip(string.ascii_uppercase, self.max_count))))
+        lines.append('d.alpha_colors    {}'.format(wcolorize(' '.join(list(string.ascii_uppercase)), ac)))
+        lines.append('d.remaining_words {} words'.format(len(self.remaining)))
+        return ('\n'.join(lines))
+
+    def pprint(self, prefix:str=None):
+        print (self.describe(prefix))
+
     def pprint_keyboard (self):
         row = 'QWERTYUIOP' 
         ac = ''.join([self.alpha_colors[c] for c in row])
@@ -179,245 +325,1093 @@ class Descriptor:
         ac = ''.join([self.alpha_colors[c] for c in row])
         print ('  {}'.format(wcolorize(' '.join(list(row)), ' '.join(list(ac)))))
 
+    @timed('update_descriptor')
     def update_descriptor (self, g:Guess, verbose:bool = False):
-        verbose = True
+        level = logging.INFO if verbose else logging.DEBUG
+        verbose = log.isEnabledFor(level)
         color_order = 'GYBX'
 
         pairs = list(zip(g.colors, g.guess))
         sorted_pairs = sorted(pairs, key=lambda pair: pair[1]+str(color_order.index(pair[0])))
         if verbose:
-            print (f'sorted_pairs = {list(sorted_pairs)}')
+            log.log(level, f'sorted_pairs = {list(sorted_pairs)}')
         first_i = 0
-        for i in range(5):
+        for i in range(len(sorted_pairs)):
             pair = sorted_pairs[i]
+            li = ord(pair[1]) - ord('A')
             if color_order.index(pair[0]) < color_order.index(self.alpha_colors[pair[1]]):
                 self.alpha_colors[pair[1]] = pair[0]
             if pair[1] != sorted_pairs[first_i][1]:
                 first_i = i
             if pair[0] == WColor.B.value:
-                self.max_count[pair[1]] = min(self.max_count[pair[1]], i - first_i)
+                self.max_count[li] = min(self.max_count[li], i - first_i)
                 if verbose:
-                    print (f'Max count of letter "{pair[1]}" is {self.max_count[pair[1]]}')
+                    log.log(level, f'Max count of letter "{pair[1]}" is {self.max_count[li]}')
             else:
-                self.min_count[pair[1]] = max(self.min_count[pair[1]], i - first_i + 1)
+                self.min_count[li] = max(self.min_count[li], i - first_i + 1)
                 if verbose:
-                    print (f'Min count of letter "{pair[1]}" is {self.min_count[pair[1]]}')
-        min_sum = sum(self.min_count.values())
-        for c in string.ascii_uppercase:
-            self.max_count[c] = min(self.max_count[c], 5 - min_sum + self.min_count[c])
+                    log.log(level, f'Min count of letter "{pair[1]}" is {self.min_count[li]}')
+        min_sum = int(self.min_count.sum())
+        np.minimum(self.max_count, len(pairs) - min_sum + self.min_count, out=self.max_count)
 
         if verbose:
-            self.pprint('update decriptor - PRE')
-            print (f'guess={g}')
-            print (f'guess={g.guess}, pairs={pairs}')
+            log.log(level, self.describe('update decriptor - PRE'))
+            log.log(level, f'guess={g}')
+            log.log(level, f'guess={g.guess}, pairs={pairs}')
         for i, (color, letter) in enumerate(pairs):
+            bit = letter_bit(letter)
             if color == 'B':
                 if g.guess.count(letter) <= 1:
-                    for s in self.sets:
-                        s -= set(letter)
+                    self.masks &= ~bit & ALL_LETTERS
                     if verbose:
-                        print (f'Letter "{letter}" removed from each position')
+                        log.log(level, f'Letter "{letter}" removed from each position')
                 else:
                     if verbose:
-                        print (f'Letter "{letter}" not removed because duplicate')
+                        log.log(level, f'Letter "{letter}" not removed because duplicate')
             elif color == 'G':
-                self.sets[i] = set(letter)
+                self.masks[i] = bit
+                self.greens[i] = ord(letter) - ord('A')
                 if verbose:
-                    print (f'All letters except "{letter}" removed from position {i}')
+                    log.log(level, f'All letters except "{letter}" removed from position {i}')
             elif color == 'Y':
-                self.sets[i] = self.sets[i] - set(letter)
+                self.masks[i] &= ~bit & ALL_LETTERS
                 if verbose:
-                    print (f'Letter "{letter}" removed from position {i}')
+                    log.log(level, f'Letter "{letter}" removed from position {i}')
         if verbose:
-            self.pprint('decriptor updated - POST')
-
-        for ch in string.ascii_uppercase:
-            if self.max_count[ch] == 0:
-                msg = False
-                for j in range(5):
-                    if ch in self.sets[j]:
-                        msg = True                        
-                        self.sets[j] = self.sets[j] - set(ch)
-                if msg:
-                    if verbose:
-                        print (f'Letter {ch} removed from each position. Because zero max count.')
+            log.log(level, self.describe('decriptor updated - POST'))
 
-    def recalculate(self, pw_counters, verbose:bool=False):
+        for li in np.flatnonzero(self.max_count == 0):
+            bit = 1 << int(li)
+            if np.any(self.masks & bit):
+                self.masks &= ~bit & ALL_LETTERS
+                if verbose:
+                    log.log(level, f'Letter {string.ascii_uppercase[li]} removed from each position. Because zero max count.')
 
-        global recalc_count
+    def hard_mode_constraints(self) -> bytes:
+        """The revealed hints every hard mode guess must use: green positions and minimum letter counts."""
+        return (self.greens.tobytes() + self.min_count.tobytes())
 
-        t0 = time.time()
+    @timed('recalculate')
+    def recalculate(self, verbose:bool=False):
+        level = logging.INFO if verbose else logging.DEBUG
+        verbose = log.isEnabledFor(level)
+        counts = self.patterns.answer_counts[self.remaining]
+        letters = self.patterns.answer_letters[self.remaining]
 
-        t1 = time.time()
+        keep_min = (counts >= self.min_count).all(axis=1)
+        if verbose: log.log(level, 'Remaining words: {} - {} = {}, applied min count rule.'.format(len(keep_min), len(keep_min) - keep_min.sum(), keep_min.sum()))
 
-        cMin = self.min_count
+        keep_max = (counts <= self.max_count).all(axis=1)
+        if verbose: log.log(level, 'Remaining words: {} - {} = {}, applied max count rule.'.format(len(keep_max), len(keep_max) - keep_max.sum(), keep_max.sum()))
 
-        t2 = time.time()
+        keep_pos = ((self.masks >> letters) & 1).all(axis=1)
+        if verbose: log.log(level, 'Remaining words: {} - {} = {}, applied position masks {}'.format(len(keep_pos), len(keep_pos) - keep_pos.sum(), keep_pos.sum(), self.regex()))
 
-        ok_words = []
-        for w in self.remaining_words:
-            keep = True
-            cWord = pw_counters[w]
-            for i in self.min_count.items():
-                if (cWord[i[0]] < i[1]):
-                    keep = False
-                    if verbose: print ('cWord={}\ncMin={}'.format(cWord, self.min_count))
-                    if verbose: print ('Remove \'{}\'. Fails min_count requirement'.format(w))
-                    break
+        self.remaining = self.remaining[keep_min & keep_max & keep_pos]
 
-            if keep:
-                ok_words.append(w)
-        if verbose: print ('Remaining words: {} - {} = {}, applied min count rule.'.format(len(self.remaining_words), len(self.remaining_words) - len(ok_words), len(ok_words)))
-        self.remaining_words = ok_words
-        
-        t3 = time.time()
-
-        ok_words = []
-        for w in self.remaining_words:
-            keep = True
-            cWord = pw_counters[w]
-            for i in cWord.items():
-                if (self.max_count[i[0]] < i[1]):
-                    keep = False
-                    if verbose: print ('cWord={}\ncMax={}'.format(cWord, self.max_count))
-                    if verbose: print ('Remove \'{}\'. Fails max count requirement'.format(w))
-                    break
+    @timed('filter_feedback')
+    def filter_feedback(self, guess:str, colors:str, verbose:bool=False):
+        """Keep the remaining answers that would give exactly these colors for this guess."""
+        gi = self.patterns.guess_index.get(guess)
+        if gi is not None:
+            codes = self.patterns.matrix[gi, self.remaining]
+        else:
+            codes = feedback_codes(guess, self.patterns.answer_letters[self.remaining])
+        keep = codes == colors_to_code(colors)
+        if verbose or log.isEnabledFor(logging.DEBUG):
+            log.log(logging.INFO if verbose else logging.DEBUG, 'Remaining words: {} - {} = {}, kept answers giving {} for {}'.format(
+                len(keep), len(keep) - keep.sum(), keep.sum(), colors, guess))
+        self.remaining = self.remaining[keep]
+
+
+def read_words_file(filename:str, length:int=None):
+    """Upper-cased words of a file, one per line. With length, only the words of that many letters A-Z."""
+    with open(filename) as file:
+        wordlist = [w.strip().upper() for w in file.read().splitlines()]
+    if length is not None:
+        wordlist = [w for w in wordlist if len(w) == length and re.match('^[A-Z]+$', w)]
+    return (wordlist)
+
+def encode_words(words, length:int=None) -> np.ndarray:
+    """Encode a list of equal length words as a (len(words), length) array of letter indices 0..25.
+    length is the word length, needed to shape an empty list, otherwise taken from the words."""
+    if len(words) == 0:
+        if length is None:
+            raise ValueError('The word length of an empty list must be given')
+        return (np.zeros((0, length), dtype=np.uint8))
+    buf = ''.join(words).encode('ascii')
+    return (np.frombuffer(buf, dtype=np.uint8).reshape(len(words), length or -1) - ord('A'))
+
+def letter_counts(letters:np.ndarray) -> np.ndarray:
+    """(len(letters), 26) array with the number of times each letter occurs in each word."""
+    counts = np.zeros((len(letters), 26), dtype=np.int8)
+    rows = np.arange(len(letters))
+    for j in range(letters.shape[1]):
+        np.add.at(counts, (rows, letters[:, j]), 1)
+    return (counts)
+
+def decode_words(letters:np.ndarray):
+    """Inverse of encode_words."""
+    length = letters.shape[1]
+    buf = (np.asarray(letters) + ord('A')).astype(np.uint8).tobytes().decode('ascii')
+    return ([buf[i:i+length] for i in range(0, len(buf), length)])
+
+def colors_to_code(colors:str) -> int:
+    """Pattern code of a color string. Each position is a base 3 digit, B=0, Y=1, G=2."""
+    code = 0
+    for c in colors:
+        code = code * 3 + 'BYG'.index(c)
+    return (code)
+
+def pattern_dtype(length:int) -> np.dtype:
+    """Smallest unsigned type holding every pattern code of words this long: 3 ** length codes."""
+    ncodes = 3 ** length
+    return (np.dtype('<u1' if ncodes <= 1 << 8 else '<u2' if ncodes <= 1 << 16 else '<u4'))
+
+def code_to_colors(code:int, length:int=5) -> str:
+    colors = []
+    for i in range(length):
+        colors.append('BYG'[code % 3])
+        code //= 3
+    return (''.join(reversed(colors)))
+
+def _as_letters(words, length:int=None) -> np.ndarray:
+    if isinstance(words, np.ndarray):
+        return (words)
+    return (encode_words(words, length))
+
+def feedback_codes(guesses, answers, chunk:int=512) -> np.ndarray:
+    """Pattern codes of guesses against answers, as Guess.compute_colors gives for each pair.
+
+    guesses and answers are a word, a list of words or an encode_words array.
+    Returns an array of shape (len(guesses), len(answers)), without the first
+    axis when guesses is a single word.
+
+    Greens are marked first. A non-green guess letter is yellow while the answer still
+    has unmatched copies of that letter, counting yellows already handed out to the
+    left, which is the two pass logic of compute_colors.
+    """
+    single = isinstance(guesses, str)
+    guess_letters = _as_letters([guesses] if single else guesses)
+    length = guess_letters.shape[1]
+    answer_letters = _as_letters([answers] if isinstance(answers, str) else answers, length)
+    dtype = pattern_dtype(length)
+    matrix = np.empty((len(guess_letters), len(answer_letters)), dtype=dtype)
+    for start in range(0, len(guess_letters), chunk):
+        g = guess_letters[start:start+chunk]
+        green = g[:, None, :] == answer_letters[None, :, :]
+        yellow = np.zeros_like(green)
+        codes = np.zeros(green.shape[:2], dtype=dtype)
+        for i in range(length):
+            gi = g[:, i][:, None]
+            avail = np.zeros(green.shape[:2], dtype=np.int8)
+            for j in range(length):
+                avail += (answer_letters[:, j][None, :] == gi) & ~green[:, :, j]
+            for k in range(i):
+                avail -= yellow[:, :, k] & (g[:, k] == g[:, i])[:, None]
+            yellow[:, :, i] = ~green[:, :, i] & (avail > 0)
+            codes = codes * 3 + 2 * green[:, :, i] + yellow[:, :, i]
+        matrix[start:start+chunk] = codes
+    return (matrix[0] if single else matrix)
+
+def check_feedback_codes(guesses, answers, sample:int=None, seed:int=0) -> int:
+    """Compare feedback_codes with Guess.compute_colors on every (guess, answer) pair, or on
+    a random sample of pairs. Raises AssertionError on the first mismatch, returns the pairs checked."""
+    codes = feedback_codes(guesses, answers)
+    if sample is None:
+        pairs = ((gi, ai) for gi in range(len(guesses)) for ai in range(len(answers)))
+        total = len(guesses) * len(answers)
+    else:
+        rng = random.Random(seed)
+        pairs = ((rng.randrange(len(guesses)), rng.randrange(len(answers))) for _ in range(sample))
+        total = sample
+    g = Guess()
+    progress = Progress(total, 'Checking feedback codes')
+    for gi, ai in pairs:
+        g.compute_colors(guesses[gi], answers[ai])
+        expected = colors_to_code(g.colors)
+        if codes[gi, ai] != expected:
+            raise AssertionError(f'{guesses[gi]} vs {answers[ai]}: compute_colors gives {g.colors}, '
+                f'feedback_codes gives {code_to_colors(int(codes[gi, ai]), len(guesses[gi]))}')
+        progress.update()
+    return (total)
+
+class PatternTable:
+    """Precomputed feedback pattern codes for every (guess, answer) pair.
+
+    Guesses are the answers followed by the remaining allowed guesses, so an
+    answer has the same index in both lists. All words have the same length,
+    and the matrix uses the smallest dtype that holds 3 ** length codes.
+    """
+    CACHE_MAGIC = b'WRDLPTRN'
+    CACHE_VERSION = 2
+    CACHE_HEADER = struct.Struct('<8sIIII32s')
+
+    def __init__(self, answers, guesses, matrix:np.ndarray):
+        self.answers = answers
+        self.guesses = guesses
+        self.matrix = matrix
+        self.length = len(answers[0])
+        self.ncodes = 3 ** self.length
+        self.digest = None
+        self.answer_index = {w: i for i, w in enumerate(self.answers)}
+        self.guess_index = {w: i for i, w in enumerate(self.guesses)}
+
+    @classmethod
+    def from_words(cls, answers, allowed_guesses):
+        answers = list(answers)
+        answer_set = set(answers)
+        guesses = answers + [w for w in allowed_guesses if w not in answer_set]
+        length = len(answers[0])
+        return (cls(answers, guesses, feedback_codes(encode_words(guesses, length), encode_words(answers, length))))
+
+    @classmethod
+    def load(cls, filename:str, digest:bytes):
+        """Memory-map a cache file read-only. Returns None if it is missing, stale or from another version."""
+        try:
+            with open(filename, 'rb') as file:
+                header = file.read(cls.CACHE_HEADER.size)
+        except OSError:
+            return (None)
+        if len(header) != cls.CACHE_HEADER.size:
+            return (None)
+        magic, version, length, n_answers, n_guesses, file_digest = cls.CACHE_HEADER.unpack(header)
+        if magic != cls.CACHE_MAGIC or version != cls.CACHE_VERSION or file_digest != digest:
+            return (None)
+        dtype = pattern_dtype(length)
+        offset = cls.CACHE_HEADER.size + (n_answers + n_guesses) * length
+        if os.path.getsize(filename) != offset + n_guesses * n_answers * dtype.itemsize:
+            return (None)
+        letters = np.memmap(filename, dtype=np.uint8, mode='r', offset=cls.CACHE_HEADER.size, shape=((n_answers + n_guesses) * length,))
+        answer_letters = letters[:n_answers * length].reshape(n_answers, length)
+        guess_letters = letters[n_answers * length:].reshape(n_guesses, length)
+        matrix = np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=(n_guesses, n_answers))
+        return (cls(decode_words(answer_letters), decode_words(guess_letters), matrix))
+
+    def save(self, filename:str, digest:bytes) -> None:
+        """Write the cache file atomically, so concurrent readers never see a partial file."""
+        header = self.CACHE_HEADER.pack(self.CACHE_MAGIC, self.CACHE_VERSION, self.length,
+            len(self.answers), len(self.guesses), digest)
+        fd, tmpname = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(header)
+                file.write(encode_words(self.answers, self.length).tobytes())
+                file.write(encode_words(self.guesses, self.length).tobytes())
+                file.write(np.ascontiguousarray(self.matrix, dtype=pattern_dtype(self.length)).tobytes())
+            os.chmod(tmpname, 0o644)
+            os.replace(tmpname, filename)
+        except BaseException:
+            os.unlink(tmpname)
+            raise
+
+    @cached_property
+    def answer_letters(self) -> np.ndarray:
+        return (np.ascontiguousarray(encode_words(self.answers, self.length)))
+
+    @cached_property
+    def answer_counts(self) -> np.ndarray:
+        return (letter_counts(self.answer_letters))
+
+    @cached_property
+    def guess_letters(self) -> np.ndarray:
+        return (np.ascontiguousarray(encode_words(self.guesses, self.length)))
+
+    @cached_property
+    def guess_counts(self) -> np.ndarray:
+        return (letter_counts(self.guess_letters))
+
+    @cached_property
+    def hard_mode_index(self):
+        return (HardModeIndex(self.guess_letters, self.guess_counts))
+
+    @cached_property
+    def guess_presence(self) -> np.ndarray:
+        return ((self.guess_counts > 0).astype(np.float32))
+
+    def coverage_order(self, rows:np.ndarray, remaining:np.ndarray) -> np.ndarray:
+        """rows sorted by how many remaining answers contain each of the guess's distinct letters, best first."""
+        return (rows[self.coverage_rank(rows, remaining)])
+
+    def coverage_rank(self, rows:np.ndarray, remaining:np.ndarray) -> np.ndarray:
+        """Positions in rows in coverage_order."""
+        present = (self.answer_counts[remaining] > 0).sum(axis=0, dtype=np.float32)
+        coverage = self.guess_presence[rows] @ present
+        return (np.argsort(-coverage, kind='stable'))
+
+    def colors(self, guess:str, answer:str) -> str:
+        """Feedback colors, from the matrix when both words are in it."""
+        gi = self.guess_index.get(guess)
+        ai = self.answer_index.get(answer)
+        if gi is not None and ai is not None:
+            return (code_to_colors(int(self.matrix[gi, ai]), self.length))
+        return (code_to_colors(int(feedback_codes(guess, answer)[0]), self.length))
+
+    def bounded_worst_buckets(self, rows:np.ndarray, remaining:np.ndarray, bound:int, block:int=None, step:int=256):
+        """Largest bucket of each guess in rows, skipping guesses whose largest bucket exceeds bound.
+
+        Guesses are taken in order, block by block, and bucket sizes are built
+        up step answers at a time. A guess is dropped as soon as one bucket
+        grows past the bound, and the bound tightens to the best complete
+        guess so far, so put the likely good guesses first.
+        Returns (rows kept, their largest bucket, final bound).
+        """
+        ncodes = self.ncodes
+        if block is None:
+            # Small blocks find a tight bound early when there are many answers to count,
+            # and with long words the block's bucket counts must still fit in cache.
+            block = min(4096, max(16, 2 ** 22 // ncodes), max(64, 2 ** 16 // max(1, len(remaining))))
+        offsets = np.arange(block, dtype=np.intp)[:, None] * ncodes
+        kept_rows = []
+        kept_worst = []
+        for start in range(0, len(rows), block):
+            alive = rows[start:start+block]
+            counts = np.zeros((len(alive), ncodes), dtype=np.int32)
+            for s0 in range(0, len(remaining), step):
+                n = len(alive)
+                sub = self.matrix[np.ix_(alive, remaining[s0:s0+step])]
+                counts += np.bincount((sub + offsets[:n]).ravel(), minlength=n * ncodes).reshape(n, ncodes)
+                ok = counts.max(axis=1) <= bound
+                if not ok.all():
+                    alive = alive[ok]
+                    counts = counts[ok]
+                    if len(alive) == 0:
+                        break
+            if len(alive) > 0:
+                worst = counts.max(axis=1)
+                bound = min(bound, int(worst.min()))
+                kept_rows.append(alive)
+                kept_worst.append(worst)
+        if len(kept_rows) == 0:
+            return (np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.int32), bound)
+        return (np.concatenate(kept_rows), np.concatenate(kept_worst), bound)
+
+    def histograms(self, rows:np.ndarray, remaining:np.ndarray, chunk:int=512) -> np.ndarray:
+        """Count of remaining answers per pattern code, one row per guess."""
+        ncodes = self.ncodes
+        counts = np.empty((len(rows), ncodes), dtype=np.int32)
+        offsets = np.arange(chunk, dtype=np.intp)[:, None] * ncodes
+        for start in range(0, len(rows), chunk):
+            sub = self.matrix[np.ix_(rows[start:start+chunk], remaining)]
+            n = len(sub)
+            flat = (sub + offsets[:n]).ravel()
+            counts[start:start+n] = np.bincount(flat, minlength=n * ncodes).reshape(n, ncodes)
+        return (counts)
+
+    def bucket_costs(self, rows:np.ndarray, remainings, cost, cells:int=1 << 21) -> np.ndarray:
+        """cost(counts, total) of each guess against each remaining set, e.g. one per board.
+
+        counts are the bucket counts of a chunk of rows, as histograms gives.
+        Only one chunk of counts exists at a time, at most about cells entries,
+        so long words with their 3 ** length codes still fit in memory. All
+        remaining sets are looked up in one pass. Returns an array of shape
+        (len(remainings), len(rows)).
+        """
+        ncodes = self.ncodes
+        columns = np.concatenate(remainings)
+        board_offsets = np.repeat(np.arange(len(remainings), dtype=np.intp) * ncodes, [len(r) for r in remainings])
+        width = len(remainings) * ncodes
+        chunk = max(1, min(cells // max(1, len(columns)), cells // width))
+        costs = np.empty((len(remainings), len(rows)), dtype=np.float64)
+        for start in range(0, len(rows), chunk):
+            sub = self.matrix[np.ix_(rows[start:start+chunk], columns)]
+            n = len(sub)
+            flat = (sub + board_offsets + np.arange(n, dtype=np.intp)[:, None] * width).ravel()
+            counts = np.bincount(flat, minlength=n * width).reshape(n, len(remainings), ncodes)
+            for b, r in enumerate(remainings):
+                costs[b, start:start+n] = cost(counts[:, b], len(r))
+        return (costs)
+
+class HardModeIndex:
+    """Finds the guesses that are legal in hard mode, using bitsets over the guess list.
+
+    A legal guess has every green letter in its position and at least the
+    revealed count of each green or yellow letter. position[p][c] is the set of
+    guesses with letter c at position p and at_least[c][k] the set with k or
+    more copies of letter c, each a Python int with one bit per guess, so the
+    legal set is a few big integer ANDs.
+    """
+    def __init__(self, letters:np.ndarray, counts:np.ndarray):
+        self.size = len(letters)
+        self.all = (1 << self.size) - 1
+        self.position = [[self._bitset(letters[:, p] == c) for c in range(26)] for p in range(letters.shape[1])]
+        self.at_least = [[self._bitset(counts[:, c] >= k) for k in range(letters.shape[1] + 1)] for c in range(26)]
+
+    @staticmethod
+    def _bitset(mask:np.ndarray) -> int:
+        return (int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little'))
+
+    def legal_bits(self, d) -> int:
+        bits = self.all
+        for p, c in enumerate(d.greens):
+            if c >= 0:
+                bits &= self.position[p][c]
+        for c in np.flatnonzero(d.min_count):
+            bits &= self.at_least[c][d.min_count[c]]
+        return (bits)
+
+    def legal(self, d) -> np.ndarray:
+        """Indices of the legal guesses for Descriptor d, in guess list order."""
+        bits = self.legal_bits(d)
+        raw = np.frombuffer(bits.to_bytes((self.size + 7) // 8, 'little'), dtype=np.uint8)
+        return (np.flatnonzero(np.unpackbits(raw, bitorder='little')[:self.size]))
+
+def word_files_digest(*filenames, word_length:int=5) -> bytes:
+    h = hashlib.sha256()
+    for filename in filenames:
+        with open(filename, 'rb') as file:
+            h.update(file.read())
+        h.update(b'\0')
+    h.update(f'length={word_length}'.encode('ascii'))
+    return (h.digest())
+
+def pattern_cache_filename(answers_file:str, guesses_file:str, word_length:int=5) -> str:
+    """CACHE_FILE for the standard game, otherwise a file per word length and pair of word files."""
+    if (answers_file, guesses_file, word_length) == (ANSWERS_FILE, GUESSES_FILE, 5):
+        return (CACHE_FILE)
+    paths = '\0'.join(os.path.abspath(f) for f in (answers_file, guesses_file))
+    root, ext = os.path.splitext(CACHE_FILE)
+    return (f'{root}-{word_length}-{hashlib.sha256(paths.encode()).hexdigest()[:12]}{ext}')
+
+_pattern_tables = {}
+
+def load_pattern_table(answers_file:str=ANSWERS_FILE, guesses_file:str=GUESSES_FILE, cache_file:str=None,
+        word_length:int=5) -> PatternTable:
+    """Pattern table for the words of word_length letters in a pair of word files, shared by every game in the process.
+
+    The table is memory-mapped from cache_file, by default pattern_cache_filename,
+    which is rebuilt when the word files no longer match the digest stored in
+    it. Files are only re-hashed when their size or modification time changes.
+    """
+    if cache_file is None:
+        cache_file = pattern_cache_filename(answers_file, guesses_file, word_length)
+    stats = tuple((os.stat(f).st_size, os.stat(f).st_mtime_ns) for f in (answers_file, guesses_file))
+    key = (answers_file, guesses_file, cache_file, word_length)
+    if key in _pattern_tables and _pattern_tables[key][0] == stats:
+        return (_pattern_tables[key][1])
+
+    digest = word_files_digest(answers_file, guesses_file, word_length=word_length)
+    table = PatternTable.load(cache_file, digest)
+    if table is None:
+        answers = read_words_file(answers_file, word_length)
+        if len(answers) == 0:
+            raise ValueError(f'No {word_length} letter words in {answers_file}')
+        table = PatternTable.from_words(answers, read_words_file(guesses_file, word_length))
+        try:
+            table.save(cache_file, digest)
+            table = PatternTable.load(cache_file, digest)
+        except OSError as e:
+            log.warning(f'Could not write pattern cache {cache_file}: {e}')
+    table.digest = digest
+    _pattern_tables[key] = (stats, table)
+    return (table)
+
+def tree_filename(hard_mode:bool, strategy:str='minimax', guess_pool:str='answers', tie_break:str='entropy') -> str:
+    return (TREE_FILE.format(('', '-hard')[hard_mode] + ('', '-' + strategy)[strategy != 'minimax']
+        + ('', '-' + guess_pool)[guess_pool != 'answers'] + ('', '-ties-' + tie_break)[tie_break != 'entropy']))
+
+class DecisionTree:
+    """Opening book: the recommended next guess for every state reached by following it.
+
+    Each node is a dict with the recommendation for that state, 'm' the strategy's
+    score, 'r' whether the guesses are possible answers and 'g'
+    the guesses, the first of which is played. 'c' maps the colors received for
+    that guess to the child node.
+    """
+    VERSION = 2
+
+    def __init__(self, root:dict, digest:bytes, hard_mode:bool, strategy:str, guess_pool:str, tie_break:str):
+        self.root = root
+        self.digest = digest
+        self.hard_mode = hard_mode
+        self.strategy = strategy
+        self.guess_pool = guess_pool
+        self.tie_break = tie_break
+
+    def lookup(self, history):
+        """Node for a list of (guess, colors) pairs, or None if the tree does not contain that state."""
+        node = self.root
+        for guess, colors in history:
+            if node['g'][0] != guess:
+                return (None)
+            node = node['c'].get(colors)
+            if node is None:
+                return (None)
+        return (node)
+
+    def save(self, filename:str) -> None:
+        doc = {'version': self.VERSION, 'digest': self.digest.hex(), 'hard_mode': self.hard_mode, 'strategy': self.strategy,
+            'guess_pool': self.guess_pool, 'tie_break': self.tie_break, 'root': self.root}
+        with gzip.open(filename, 'wt', encoding='ascii') as file:
+            json.dump(doc, file, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, filename:str, digest:bytes, hard_mode:bool, strategy:str, guess_pool:str, tie_break:str):
+        """Returns None if the file is missing or was built for other word lists or settings."""
+        try:
+            with gzip.open(filename, 'rt', encoding='ascii') as file:
+                doc = json.load(file)
+        except (OSError, ValueError):
+            return (None)
+        if (doc.get('version') != cls.VERSION or doc.get('digest') != digest.hex() or doc.get('hard_mode') != hard_mode
+                or doc.get('strategy') != strategy or doc.get('guess_pool') != guess_pool or doc.get('tie_break') != tie_break):
+            return (None)
+        return (cls(doc['root'], digest, hard_mode, strategy, guess_pool, tie_break))
+
+class SearchCache:
+    """Bounded memo of best_guesses results keyed by the set of remaining answers.
+
+    Many guess sequences lead to the same remaining set, so the search result
+    is reused. policy is 'lru' (a hit refreshes the entry) or 'fifo'.
+    """
+    def __init__(self, maxsize:int=4096, policy:str='lru'):
+        if policy not in ('lru', 'fifo'):
+            raise ValueError(f'Unknown cache policy {policy!r}')
+        self.maxsize = maxsize
+        self.policy = policy
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(remaining:np.ndarray, hard_mode:bool, strategy:str, guess_pool:str, constraints:bytes=b''):
+        return (hard_mode, strategy, guess_pool, constraints, len(remaining),
+            hashlib.blake2b(remaining.tobytes(), digest_size=16).digest())
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return (None)
+        self.hits += 1
+        if self.policy == 'lru':
+            self.entries.move_to_end(key)
+        return (value)
+
+    def put(self, key, value) -> None:
+        if self.maxsize <= 0:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return ({'size': len(self.entries), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses,
+            'evictions': self.evictions, 'hit_rate': self.hits / lookups if lookups else 0.0})
 
-            if keep:
-                ok_words.append(w)
+    def __str__(self):
+        st = self.stats()
+        return ('{hits} hits, {misses} misses ({hit_rate:.1%}), {size}/{maxsize} entries, {evictions} evictions'.format(**st))
 
-        if verbose: print ('Remaining words: {} - {} = {}, applied max count rule.'.format(len(self.remaining_words), len(self.remaining_words) - len(ok_words), len(ok_words)))
-        self.remaining_words = ok_words
+class Strategy:
+    """How best_guesses ranks candidate guesses.
 
-        t4 = time.time()
+    Every strategy works from bucket counts, see PatternTable.bucket_costs.
+    evaluate returns the rows it scored, their cost (lower is better) and the
+    best cost; value turns a cost into the number shown to the player.
+    """
+    name = None
+
+    def evaluate(self, patterns, rows:np.ndarray, remaining:np.ndarray, hard_mode:bool):
+        costs = self.row_costs(patterns, rows, remaining)
+        return (rows, costs, costs.min())
+
+    def row_costs(self, patterns, rows:np.ndarray, remaining:np.ndarray) -> np.ndarray:
+        return (patterns.bucket_costs(rows, [remaining], self.costs)[0])
 
-        regex = ''.join(['[' + ''.join(sorted(s)) + ']' for s in self.sets])
-        if verbose: print (regex)
-        ok_words = re.findall(regex, ' '.join(self.remaining_words)) or []
+    def iter_evaluate(self, patterns, rows:np.ndarray, remaining:np.ndarray, hard_mode:bool, block:int=256, deadline:float=None):
+        """Like evaluate, a block of (rows, costs, exact) at a time with the most promising guesses first.
 
-        if verbose: print ('Remaining words: {} - {} = {}, applied regex'.format(len(self.remaining_words), len(self.remaining_words) - len(ok_words), len(ok_words)))
-        self.remaining_words = ok_words
+        Rows left out can not beat the best cost already yielded. Costs that are
+        not exact are a provisional ranking, superseded by the first exact block.
+        Work that can run long checks deadline, a time.perf_counter value, and
+        raises TimeoutError once it has passed.
+        """
+        rows = patterns.coverage_order(rows, remaining)
+        for start in range(0, len(rows), block):
+            sub = rows[start:start+block]
+            yield (sub, self.row_costs(patterns, sub, remaining), True)
+
+    def costs(self, counts:np.ndarray, total:int) -> np.ndarray:
+        raise NotImplementedError
 
-        t5 = time.time()
-        
-        recalc_timers[0] += t5 - t0
-        recalc_timers[1] += t1 - t0
-        recalc_timers[2] += t2 - t1
-        recalc_timers[3] += t3 - t2
-        recalc_timers[4] += t4 - t3
-        recalc_timers[5] += t5 - t4
-        
-        recalc_count += 1
-        if (recalc_count % 10 == 0):
-            pctg = [recalc_timers[i]/recalc_timers[0]*100.0 for i in range(1,6)]
-            #print ('Recalc: {:6.2f}  {:6.2f}%  {:6.2f}%  {:6.2f}%  {:6.2f}%  {:6.2f}%  '.format(recalc_timers[0], *pctg))
+    def value(self, cost):
+        return (cost)
+
+    def combine(self, costs:np.ndarray, weights:np.ndarray) -> np.ndarray:
+        """Joint cost of each guess over several boards, from costs of shape (boards, guesses).
+        weights is how many of the boards have each row's remaining set."""
+        return (weights @ costs)
+
+    def describe(self, value) -> str:
+        raise NotImplementedError
+
+class MinimaxStrategy(Strategy):
+    """Smallest worst case bucket."""
+    name = 'minimax'
+
+    def evaluate(self, patterns, rows:np.ndarray, remaining:np.ndarray, hard_mode:bool):
+        rows = patterns.coverage_order(rows, remaining)
+        return (patterns.bounded_worst_buckets(rows, remaining, len(remaining)))
+
+    def iter_evaluate(self, patterns, rows:np.ndarray, remaining:np.ndarray, hard_mode:bool, block:int=256, deadline:float=None):
+        rows = patterns.coverage_order(rows, remaining)
+        bound = len(remaining)
+        for start in range(0, len(rows), block):
+            kept, worst, bound = patterns.bounded_worst_buckets(rows[start:start+block], remaining, bound)
+            yield (kept, worst, True)
+
+    def costs(self, counts:np.ndarray, total:int) -> np.ndarray:
+        return (counts.max(axis=1))
+
+    def value(self, cost):
+        return (int(cost))
+
+    def combine(self, costs:np.ndarray, weights:np.ndarray) -> np.ndarray:
+        # The worst bucket over all boards, ties broken by the summed worst buckets,
+        # scaled to stay below 1 so value() still shows the worst bucket.
+        total = weights @ costs
+        return (costs.max(axis=0) + total / (total.max() + 1))
+
+    def describe(self, value) -> str:
+        return (f'This will reduce the set of remaining possibilities to at most {value} words.')
+
+class ExpectedSizeStrategy(Strategy):
+    """Smallest expected number of remaining words."""
+    name = 'expected'
+
+    def costs(self, counts:np.ndarray, total:int) -> np.ndarray:
+        return ((counts.astype(np.float64) ** 2).sum(axis=1) / total)
+
+    def value(self, cost):
+        return (round(float(cost), 3))
+
+    def describe(self, value) -> str:
+        return (f'This will reduce the set of remaining possibilities to {value:.1f} words on average.')
+
+class EntropyStrategy(Strategy):
+    """Most information, in bits, from the feedback colors."""
+    name = 'entropy'
+
+    def costs(self, counts:np.ndarray, total:int) -> np.ndarray:
+        c = counts.astype(np.float64)
+        clogc = c * np.log2(np.where(c > 0, c, 1))
+        return (clogc.sum(axis=1) / total - np.log2(total))
+
+    def value(self, cost):
+        return (round(float(-cost), 3))
+
+    def describe(self, value) -> str:
+        return (f'This will give {value:.2f} bits of information on average.')
+
+class ExpectedGuessesStrategy(Strategy):
+    """Fewest expected guesses to solve, by exact search depth moves ahead.
+
+    Beyond the search depth a set of n words is assumed to take estimate(n)
+    more guesses, a fit to the minimax solver's results. Only the width most
+    promising guesses by that one move estimate are searched further.
+    """
+    name = 'guesses'
+
+    def __init__(self, depth:int=2, width:int=10):
+        self.depth = depth
+        self.width = width
+
+    @staticmethod
+    def estimate(n):
+        n = np.asarray(n, dtype=np.float64)
+        return (np.where(n <= 1, n, 1.5 + 0.3 * np.log(np.maximum(n, 2) / 2)))
+
+    def costs(self, counts:np.ndarray, total:int) -> np.ndarray:
+        solved = counts.shape[1] - 1
+        c = counts.astype(np.float64)
+        c[:, solved] = 0
+        return (1 + (c * self.estimate(c)).sum(axis=1) / total)
+
+    def value(self, cost):
+        return (round(float(cost), 3))
+
+    def describe(self, value) -> str:
+        return (f'This will solve the puzzle in {value:.2f} more guesses on average.')
+
+    def evaluate(self, patterns, rows:np.ndarray, remaining:np.ndarray, hard_mode:bool):
+        one_step = self.row_costs(patterns, rows, remaining)
+        if self.depth <= 1:
+            return (rows, one_step, one_step.min())
+        memo = {}
+        candidates = rows[np.argsort(one_step, kind='stable')[:self.width]]
+        costs = np.array([self._expected(patterns, row, remaining, rows, hard_mode, self.depth, memo) for row in candidates])
+        return (candidates, costs, costs.min())
+
+    def iter_evaluate(self, patterns, rows:np.ndarray, remaining:np.ndarray, hard_mode:bool, block:int=256, deadline:float=None):
+        # The one move estimates come first, a block at a time in coverage order, as
+        # a provisional ranking. They pick the candidates for the deeper search,
+        # which are then searched one by one.
+        one_step = np.empty(len(rows))
+        rank = patterns.coverage_rank(rows, remaining)
+        for start in range(0, len(rows), block):
+            at = rank[start:start+block]
+            one_step[at] = self.row_costs(patterns, rows[at], remaining)
+            yield (rows[at], one_step[at], self.depth <= 1)
+        if self.depth <= 1:
+            return
+        memo = {}
+        for row in rows[np.argsort(one_step, kind='stable')[:self.width]]:
+            yield (row[None], np.array([self._expected(patterns, row, remaining, rows, hard_mode, self.depth, memo, deadline)]), True)
+
+    def _expected(self, patterns, row, remaining, rows, hard_mode, depth, memo, deadline:float=None) -> float:
+        codes = patterns.matrix[row, remaining]
+        solved = patterns.ncodes - 1
+        total = 1.0
+        for code in np.unique(codes):
+            if deadline is not None and time.perf_counter() >= deadline:
+                raise TimeoutError('Search deadline passed')
+            if code != solved:
+                bucket = remaining[codes == code]
+                total += len(bucket) / len(remaining) * self._solve_cost(patterns, bucket, rows, hard_mode, depth - 1, memo, deadline)
+        return (total)
+
+    def _solve_cost(self, patterns, remaining, rows, hard_mode, depth, memo, deadline:float=None) -> float:
+        """Expected guesses to solve remaining, playing the best guess."""
+        if len(remaining) <= 2 or depth <= 0:
+            return (float(self.estimate(len(remaining))))
+        key = (depth, remaining.tobytes())
+        if key not in memo:
+            # Deeper hard mode levels only try the remaining words, the hints of
+            # the hypothetical states are not tracked.
+            pool = remaining if hard_mode else rows
+            one_step = self.row_costs(patterns, pool, remaining)
+            if depth == 1:
+                memo[key] = float(one_step.min())
+            else:
+                candidates = pool[np.argsort(one_step, kind='stable')[:self.width]]
+                memo[key] = min(self._expected(patterns, row, remaining, rows, hard_mode, depth, memo, deadline) for row in candidates)
+        return (memo[key])
 
+STRATEGIES = {s.name: s for s in (MinimaxStrategy, ExpectedSizeStrategy, EntropyStrategy, ExpectedGuessesStrategy)}
 
-def read_words_file(filename:str):
-    with open(filename) as file:
-        wordlist = [w.upper() for w in file.read().splitlines()]
-    return (wordlist)
+def make_strategy(name:str) -> Strategy:
+    if name not in STRATEGIES:
+        raise ValueError(f'Unknown strategy {name!r}, expected one of {", ".join(STRATEGIES)}')
+    return (STRATEGIES[name]())
 
 class Wordle:
-    def __init__(self):
+    FIRST_GUESS = 'ARISE'
+
+    GUESS_POOLS = ('answers', 'all')
+    FILTER_MODES = ('pattern', 'descriptor')
+    TIE_BREAKS = ('lexical', 'random') + tuple(STRATEGIES)
+
+    def __init__(self, seed=None, cache_size:int=4096, cache_policy:str='lru', strategy:str='minimax', guess_pool:str='answers',
+            filter_mode:str='pattern', word_length:int=5, answers_file:str=ANSWERS_FILE, guesses_file:str=GUESSES_FILE,
+            tie_break:str='entropy'):
+        if guess_pool not in self.GUESS_POOLS:
+            raise ValueError(f'Unknown guess pool {guess_pool!r}, expected one of {", ".join(self.GUESS_POOLS)}')
+        if filter_mode not in self.FILTER_MODES:
+            raise ValueError(f'Unknown filter mode {filter_mode!r}, expected one of {", ".join(self.FILTER_MODES)}')
+        if tie_break not in self.TIE_BREAKS:
+            raise ValueError(f'Unknown tie-break {tie_break!r}, expected one of {", ".join(self.TIE_BREAKS)}')
         self.auto_mode = False
         self.hard_mode = False
+        self.strategy = make_strategy(strategy)
+        self.guess_pool = guess_pool
+        # 'pattern' keeps the answers whose feedback matches exactly, 'descriptor'
+        # filters by the letter constraints accumulated in the Descriptor.
+        self.filter_mode = filter_mode
+        # Equally good guesses are listed possible answers first, then by the
+        # tie_break strategy's score, then alphabetically. 'random' instead
+        # samples them with self.rng, the only use of it besides picking answers.
+        self.tie_break = tie_break
+        self.tie_strategy = make_strategy(tie_break) if tie_break in STRATEGIES else None
+        self.word_length = word_length
+        self.answers_file = answers_file
+        self.guesses_file = guesses_file
+        self.use_tree = True
+        # Seconds recommend may spend searching, None for no limit. exhaustive
+        # tells whether the last recommendation was searched to the end.
+        self.budget = None
+        self.exhaustive = True
         self.stats = Counter()
+        self.rng = random.Random(seed)
+        self.cache = SearchCache(cache_size, cache_policy)
+        self.trees = {}
         self.reset_state()
 
     def reset_state(self):
-        self.possible_words = read_words_file("wordle-answers-alphabetical.txt")
-        self.possible_guesses = read_words_file("wordle-allowed-guesses.txt")
-        self.state = Descriptor(self.possible_words)
+        patterns = load_pattern_table(self.answers_file, self.guesses_file, word_length=self.word_length)
+        if patterns is not getattr(self, 'patterns', None):
+            # The word files changed: cached results index rows of the old table.
+            self.cache.clear()
+            self.trees = {}
+        self.patterns = patterns
+        self.possible_words = self.patterns.answers
+        self.possible_guesses = self.patterns.guesses[len(self.possible_words):]
+        self.state = Descriptor(self.patterns)
         self.answer = None
         self.guesses = []
-        self.pw_counters = {}
-        for w in self.possible_words:
-            self.pw_counters[w] = Counter(w)
+
+    def first_guess(self) -> str:
+        """FIRST_GUESS, or the best opening guess when FIRST_GUESS is not a word of this game."""
+        if self.FIRST_GUESS in self.patterns.guess_index:
+            return (self.FIRST_GUESS)
+        return (self.best_guesses(Descriptor(self.patterns), 1)[1][0])
 
     def best_guesses(self, d: Descriptor, guess_count:int=5):
-        scores = Counter()
-        word_count = 0
-        ans_count = 0
-        print_count = 0
-        total = len(self.possible_words) * len(d.remaining_words)
-        start_time = time.time()
-        min_of_max = len(self.possible_words)
-
-        timers = [0] * 6
-
-        if (self.hard_mode):
-            guess_words = d.remaining_words
+        constraints = d.hard_mode_constraints() if self.hard_mode else b''
+        key = SearchCache.key(d.remaining, self.hard_mode, self.strategy.name, self.guess_pool, constraints)
+        result = self.cache.get(key)
+        metrics.count(('cache_misses', 'cache_hits')[result is not None])
+        if result is None:
+            result = self.search(d)
+            self.cache.put(key, result)
+        (min_of_max, recs, is_remaing) = result
+        return (min_of_max, self.pick(recs, guess_count), is_remaing)
+
+    def pick(self, recs, guess_count:int):
+        """The first guess_count of a search result's guesses, or a seeded sample with tie_break 'random'."""
+        if (self.tie_break == 'random' and guess_count < len(recs)):
+            return (self.rng.sample(recs, guess_count))
+        return (list(recs[:guess_count]))
+
+    @timed('scoring')
+    def search(self, d: Descriptor):
+        """Search with the game's strategy. Returns (score, all tied best guesses, is_remaining)."""
+        remaining = d.remaining
+        if (len(remaining) == 0):
+            return (0, [], True)
+
+        if (len(remaining) <= 2):
+            # With one or two words left, guessing one of them is as good as it gets.
+            rows = remaining
         else:
-            guess_words = self.possible_words
-
-        for word in guess_words:
-            score = []
-
-            g = Guess()
-            g.guess = word
-
-            word_count += 1
-            ans_count = (word_count - 1) * len(d.remaining_words)
-            for ans in d.remaining_words:
-                t1 = time.time()
-                dd = self.state.copy()
-                t2 = time.time()
-                g.compute_colors(g.guess, ans)
-                t3 = time.time()
-                #print ('g={} ans={}'.format(g, ans))
-                dd.update_descriptor(g)
-                t4 = time.time()
-                dd.recalculate(self.pw_counters, False)
-                t5 = time.time()
-
-                score.append(len(dd.remaining_words))
-                if (len(dd.remaining_words) > min_of_max):
-                    score.append(9999)
-                    break
-
-                t6 = time.time()
-
-                print_count += 1
-                ans_count += 1 
-                elapsed_time = time.time() - start_time
-                print ('Evaluating {} scenarios: {:6.2f}% complete. (Rate: {}/sec)'.format(total, (ans_count / total) * 100, ans_count // elapsed_time), end ='\r')
-            
-                t7 = time.time()
-
-                timers[0] += t2 - t1
-                timers[1] += t3 - t2
-                timers[2] += t4 - t3
-                timers[3] += t5 - t4
-                timers[4] += t6 - t5
-                timers[5] += t7 - t6
-
-                if (print_count % 10 == 0):
-                    total_time = sum(timers)
-                    timers_pctg = [x / total_time * 100.0 for x in timers]
-                    #print ('{}'.format(timers), end='\r')
-                    if False:
-                        print ('Total: {:6.2f} Timers: {:6.2f}%  {:6.2f}%  {:6.2f}%  {:6.2f}%  {:6.2f}%  {:6.2f}%x'.format(total_time,
-                            timers_pctg[0], timers_pctg[1], timers_pctg[2], timers_pctg[3], timers_pctg[4], timers_pctg[5]), end='\r')
-
-            #print (word, score)
-            if max(score) != 9999:
-                scores[word] = max(score)
-                min_of_max = min(min_of_max, scores[word])
-        
-        print()
-
-        #print ('{}\n{}\n{}'.format('=' * 80, scores, '=' * 80))
-
+            rows = self.candidate_rows(d)
+
+        rows, costs, best_cost = self.strategy.evaluate(self.patterns, rows, remaining, self.hard_mode)
+        return (self._result(best_cost, rows[costs <= best_cost + 1e-9], remaining))
+
+    def iter_search(self, d: Descriptor, block:int=256, deadline:float=None):
+        """search, yielding (score, tied best guesses, is_remaining, exhaustive) each time the best
+        guesses found so far change, most promising candidates first.
+
+        When the search completes, the last result is repeated with exhaustive
+        True and is the same as search gives. With deadline, a time.perf_counter
+        value, the search stops without that final result once the deadline has
+        passed and at least one result was yielded.
+        """
+        remaining = d.remaining
+        if (len(remaining) == 0):
+            yield (0, [], True, True)
+            return
+        rows = remaining if len(remaining) <= 2 else self.candidate_rows(d)
+
+        best_cost = np.inf
+        best_rows = []
+        result = None
+        exact_seen = False
+        blocks = self.strategy.iter_evaluate(self.patterns, rows, remaining, self.hard_mode, block, deadline)
+        try:
+            for sub, costs, exact in blocks:
+                if exact and not exact_seen:
+                    # Provisional costs are on another scale, start over from the first exact block.
+                    exact_seen = True
+                    best_cost = np.inf
+                    best_rows = []
+                if (exact or not exact_seen) and len(sub) > 0 and costs.min() <= best_cost + 1e-9:
+                    if costs.min() < best_cost - 1e-9:
+                        best_cost = costs.min()
+                        best_rows = []
+                    best_rows.append(sub[costs <= best_cost + 1e-9])
+                    result = self._result(best_cost, np.concatenate(best_rows), remaining)
+                    yield result + (False,)
+                if deadline is not None and result is not None and time.perf_counter() >= deadline:
+                    return
+        except TimeoutError:
+            if result is not None:
+                return
+            raise
+        yield result + (True,)
+
+    def _result(self, best_cost, best_rows:np.ndarray, remaining:np.ndarray):
+        """(score, best guesses, is_remaining) for the rows tied at best_cost, preferring possible answers."""
         is_remaing = True
-        recs = {x: scores[x] for x in d.remaining_words if x in scores and scores[x] <= min_of_max}
+        recs = best_rows[np.isin(best_rows, remaining)]
         if (len(recs) == 0):
             is_remaing = False
-            recs = {x: count for x, count in scores.items() if count <= min_of_max}
-        recs = recs.keys()
-        if (guess_count < len(recs)):
-            recs = random.sample(recs, guess_count)
-        return (min_of_max, list(recs), is_remaing)
+            recs = best_rows
+        return (self.strategy.value(best_cost), self.order_ties(recs, [remaining]), is_remaing)
+
+    def order_ties(self, rows:np.ndarray, remainings, weights:np.ndarray=None):
+        """Words of equally good guess rows in tie-break order, for one or several boards' remaining sets."""
+        words = [self.patterns.guesses[i] for i in rows]
+        if (self.tie_strategy is None or len(rows) <= 1):
+            return (sorted(words))
+        if weights is None:
+            weights = np.ones(len(remainings))
+        costs = self.patterns.bucket_costs(np.asarray(rows), remainings, self.tie_strategy.costs)
+        scores = self.tie_strategy.combine(costs, weights)
+        return ([w for _, w in sorted(zip(scores.tolist(), words))])
+
+    def best_guesses_within(self, d: Descriptor, budget:float, guess_count:int=5):
+        """best_guesses, stopping the search after budget seconds with the best guesses found so far.
+        Returns (score, guesses, is_remaining, exhaustive)."""
+        deadline = time.perf_counter() + budget
+        constraints = d.hard_mode_constraints() if self.hard_mode else b''
+        key = SearchCache.key(d.remaining, self.hard_mode, self.strategy.name, self.guess_pool, constraints)
+        result = self.cache.get(key)
+        metrics.count(('cache_misses', 'cache_hits')[result is not None])
+        exhaustive = result is not None
+        if result is None:
+            for *result, exhaustive in self.iter_search(d, deadline=deadline):
+                if exhaustive:
+                    self.cache.put(key, tuple(result))
+            if not exhaustive:
+                metrics.count('budget_expired')
+        (score, recs, is_remaining) = result
+        return (score, self.pick(recs, guess_count), is_remaining, exhaustive)
+
+    def candidate_rows(self, d: Descriptor=None) -> np.ndarray:
+        """Guess indices to consider given the guess pool, and in hard mode the hints in d."""
+        if (self.hard_mode and d is not None):
+            rows = self.patterns.hard_mode_index.legal(d)
+            if (self.guess_pool == 'answers'):
+                rows = rows[rows < len(self.possible_words)]
+            return (rows)
+        if (self.guess_pool == 'all'):
+            return (np.arange(len(self.patterns.guesses), dtype=np.intp))
+        return (np.arange(len(self.possible_words), dtype=np.intp))
+
+    def best_joint_guesses(self, boards, guess_count:int=5):
+        """best_guesses for several boards answered by the same guesses, e.g. the unsolved boards of a MultiBoard.
+
+        There is no hard mode here: the hints of different boards usually leave
+        no useful guess that is legal on all of them.
+        """
+        key = ('joint',) + tuple(sorted(SearchCache.key(d.remaining, False, self.strategy.name, self.guess_pool) for d in boards))
+        result = self.cache.get(key)
+        metrics.count(('cache_misses', 'cache_hits')[result is not None])
+        if result is None:
+            result = self.joint_search(boards)
+            self.cache.put(key, result)
+        (score, recs, is_remaining) = result
+        return (score, self.pick(recs, guess_count), is_remaining)
+
+    @timed('joint_scoring')
+    def joint_search(self, boards):
+        """Score every candidate guess on all boards at once, combining the boards' costs
+        with the strategy's combine. Returns (score, all tied best guesses, is_remaining)."""
+        unique = {}
+        for d in boards:
+            if len(d.remaining) > 0:
+                unique.setdefault(d.remaining.tobytes(), [d.remaining, 0])[1] += 1
+        if (len(unique) == 0):
+            return (0, [], True)
+        remainings = [r for r, _ in unique.values()]
+        weights = np.array([w for _, w in unique.values()], dtype=np.float64)
+
+        singles = np.unique([r[0] for r in remainings if len(r) == 1])
+        if (len(singles) > 0):
+            # A board down to one word has to be guessed anyway, so pick which one to play first.
+            rows = singles.astype(np.intp)
+        else:
+            rows = self.candidate_rows()
+        costs = self.patterns.bucket_costs(rows, remainings, self.strategy.costs)
+        joint = self.strategy.combine(costs, weights)
+        best_cost = joint.min()
+
+        is_remaining = True
+        best = rows[joint <= best_cost + 1e-9]
+        recs = best[np.isin(best, np.concatenate(remainings))]
+        if (len(recs) == 0):
+            is_remaining = False
+            recs = best
+        return (self.strategy.value(best_cost), self.order_ties(recs, remainings, weights), is_remaining)
+
+    def decision_tree(self):
+        """The opening book for the current mode, if one has been built for these word lists."""
+        if not self.use_tree:
+            return (None)
+        key = (self.hard_mode, self.strategy.name, self.guess_pool, self.tie_break)
+        if key not in self.trees:
+            filename = tree_filename(*key)
+            self.trees[key] = DecisionTree.load(filename, self.patterns.digest, *key)
+        return (self.trees[key])
+
+    def recommend(self, d: Descriptor, history, guess_count:int=5):
+        """Like best_guesses, but answered from the opening book when it contains the state,
+        and within self.budget seconds when that is set."""
+        self.exhaustive = True
+        tree = self.decision_tree()
+        if tree is not None:
+            node = tree.lookup(history)
+            if node is not None:
+                metrics.count('tree_hits')
+                return (node['m'], node['g'][:guess_count], node['r'])
+            metrics.count('tree_misses')
+        if self.budget is not None:
+            (score, recs, is_remaining, self.exhaustive) = self.best_guesses_within(d, self.budget, guess_count)
+            return (score, recs, is_remaining)
+        return (self.best_guesses(d, guess_count))
+
+    def apply_feedback(self, d: Descriptor, g: Guess) -> None:
+        """Update d with the colors received for a guess."""
+        d.update_descriptor(g)
+        if (self.filter_mode == 'pattern'):
+            d.filter_feedback(g.guess, g.colors)
+        else:
+            d.recalculate()
+
+    def replay(self, history) -> Descriptor:
+        """Descriptor after a list of (guess, colors) pairs, e.g. from a game played elsewhere."""
+        d = Descriptor(self.patterns)
+        for guess, colors in history:
+            g = Guess(self.word_length)
+            if not g.parse_guess(str(guess).upper()):
+                raise ValueError(f'Guess must be {self.word_length} letters [A-Z], got {guess!r}')
+            if not g.parse_colors(str(colors).upper()):
+                raise ValueError(f'Colors must be {self.word_length} colors [GYB], got {colors!r}')
+            self.apply_feedback(d, g)
+        return (d)
+
+    def report(self, hard_mode:bool, history, count:int=5) -> dict:
+        """Remaining words and recommended guesses after a (guess, colors) history."""
+        self.hard_mode = hard_mode
+        try:
+            d = self.replay(history)
+            words = d.remaining_words
+            (score, recs, is_remaining) = self.recommend(d, list(history), count)
+        except ValueError as e:
+            return ({'error': str(e)})
+        return ({'remaining': len(words), 'words': words[:MAX_REPORT_WORDS], 'recommend': recs, 'score': score,
+            'is_remaining': is_remaining, 'exhaustive': self.exhaustive})
+
+    def solve(self, answer:str, max_guesses:int=20):
+        """Auto-solve one answer without any UI. Returns the list of guesses played."""
+        d = Descriptor(self.patterns)
+        path = []
+        history = []
+        while len(path) < max_guesses:
+            g = Guess(self.word_length)
+            if len(path) == 0:
+                g.guess = self.first_guess()
+            else:
+                g.guess = self.recommend(d, history, 1)[1][0]
+            g.colors = self.patterns.colors(g.guess, answer)
+            path.append(g.guess)
+            history.append((g.guess, g.colors))
+            if g.guess == answer:
+                break
+            self.apply_feedback(d, g)
+        return (path)
+
+    def history(self):
+        return ([(g.guess, g.colors) for g in self.guesses])
 
     def play(self):
         g = None
@@ -436,7 +1430,7 @@ class Wordle:
                     print ('Complete all words. Exiting.')
                     exit()
             else:
-                self.answer = random.choice(self.possible_words)
+                self.answer = self.rng.choice(self.possible_words)
                 print ('Picking a random wordle from {} possibilities.'.format(len(self.possible_words)))
 
             while True:                
@@ -456,12 +1450,12 @@ class Wordle:
                     if (not self.auto_mode):
                         self.state.pprint_keyboard()
 
-                    g = Guess()
+                    g = Guess(self.word_length)
                     if (self.auto_mode):
                         if (count+1 == 1):
-                            g.guess = 'ARISE'
+                            g.guess = self.first_guess()
                         else:
-                            (frw, words, ispw)  = self.best_guesses(self.state)
+                            (frw, words, ispw)  = self.recommend(self.state, self.history())
                             g.guess = words[0]
                     else:
                         g.collect_input('Guess  #{}:  ', count+1)
@@ -478,16 +1472,18 @@ class Wordle:
                             print (f'{("  " + " ".join(self.state.remaining_words[0:7]), "")[lp > 8]}')
                         
                         if (g.cmd == WCommand.Recommend):
-                            (frw, words, ispw)  = self.best_guesses(self.state)
-                            print (f'Try one of these {("","*possible* ")[ispw==1]}words: [{','.join(words)}]')
-                            print (f'This will reduce the set of remaining possibilities to at most {frw} words.')
+                            (frw, words, ispw)  = self.recommend(self.state, self.history())
+                            print (f'Try one of these {("","*possible* ")[ispw==1]}words: [{",".join(words)}]')
+                            print (self.strategy.describe(frw))
+                            if not self.exhaustive:
+                                print (f'Search stopped after {self.budget * 1000:.0f} ms; these are the best guesses found so far.')
                             continue
                         
                         elif (g.cmd == WCommand.NewWord):
                             self.answer = None
                             count = 0
                             self.reset_state()
-                            self.answer = random.choice(self.possible_words)
+                            self.answer = self.rng.choice(self.possible_words)
                             print ('OK. picking a random wordle from {} possibilities.'.format(len(self.possible_words)))
                             continue
 
@@ -527,9 +1523,8 @@ class Wordle:
                         break
 
                 count += 1
-                self.state.update_descriptor(g)
+                self.apply_feedback(self.state, g)
                 self.guesses.append(g)
-                self.state.recalculate(self.pw_counters, False)
 
 
                 if g.guess == self.answer:
@@ -545,6 +1540,7 @@ class Wordle:
                     print (f'Wordle {g} found in {count} guesses!')
                     if self.auto_mode:
                         print (f'Summary solving stats: {self.stats}')
+                        print (f'Search cache: {self.cache}')
                         if not self.hard_mode and count > 6:
                             print ('Auto failed to solve in 6 guesses.')
                             exit()
@@ -554,9 +1550,181 @@ class Wordle:
                 break
         print ('Quitting')
 
-def main(fname):
-    game = Wordle()
-    game.play()
+class MultiBoard:
+    """Several boards played with the same guesses, as in Quordle (4 boards) or Octordle (8).
+
+    Each board keeps its own Descriptor. Guesses are scored jointly over the
+    boards not yet solved with Wordle.best_joint_guesses.
+    """
+    def __init__(self, game:Wordle, count:int=4):
+        self.game = game
+        self.boards = [Descriptor(game.patterns) for _ in range(count)]
+        self.solved = [False] * count
+        self.guesses = []
+
+    def unsolved(self):
+        return ([d for d, solved in zip(self.boards, self.solved) if not solved])
+
+    def done(self) -> bool:
+        return (all(self.solved))
+
+    def recommend(self, guess_count:int=5):
+        return (self.game.best_joint_guesses(self.unsolved(), guess_count))
+
+    def apply(self, guess:str, colors) -> None:
+        """Update every unsolved board with its colors for guess, one color string per board.
+        Entries for boards already solved are ignored."""
+        if len(colors) != len(self.boards):
+            raise ValueError(f'Expected colors for {len(self.boards)} boards, got {len(colors)}')
+        length = self.game.word_length
+        if not Guess(length).parse_guess(str(guess).upper()):
+            raise ValueError(f'Guess must be {length} letters [A-Z], got {guess!r}')
+        # Parse every board before updating any, so a bad color string leaves
+        # all boards as they were.
+        updates = []
+        for i, d in enumerate(self.boards):
+            if self.solved[i]:
+                continue
+            g = Guess(length)
+            g.parse_guess(str(guess).upper())
+            if not g.parse_colors(str(colors[i]).upper()):
+                raise ValueError(f'Colors must be {length} colors [GYB], got {colors[i]!r}')
+            updates.append((i, d, g))
+        for i, d, g in updates:
+            self.game.apply_feedback(d, g)
+            self.solved[i] = g.colors == 'G' * length
+        self.guesses.append(guess)
+
+    def solve(self, answers, max_guesses:int=20):
+        """Auto-solve one answer per board without any UI. Returns the list of guesses played."""
+        while not self.done() and len(self.guesses) < max_guesses:
+            if len(self.guesses) == 0:
+                guess = self.game.first_guess()
+            else:
+                guess = self.recommend(1)[1][0]
+            self.apply(guess, [self.game.patterns.colors(guess, answer) for answer in answers])
+        return (list(self.guesses))
+
+MAX_REPORT_WORDS = 20
+
+def parse_game_request(request) -> tuple:
+    """Validate a request object, returning the (hard_mode, history, count) state it asks about.
+
+    request is a dict with "guesses" and "colors" lists and optional "hard_mode"
+    and "count", or just a list of (guess, colors) pairs.
+    """
+    if isinstance(request, (list, tuple)):
+        if not all(isinstance(p, (list, tuple)) and len(p) == 2 for p in request):
+            raise ValueError('A history must be a list of (guess, colors) pairs')
+        request = {'guesses': [p[0] for p in request], 'colors': [p[1] for p in request]}
+    if not isinstance(request, dict):
+        raise ValueError('Request must be a JSON object')
+    guesses = request.get('guesses', [])
+    colors = request.get('colors', [])
+    if not isinstance(guesses, list) or not isinstance(colors, list) or len(guesses) != len(colors):
+        raise ValueError('"guesses" and "colors" must be lists of the same length')
+    history = tuple((str(g).upper(), str(c).upper()) for g, c in zip(guesses, colors))
+    count = request.get('count', 5)
+    if not isinstance(count, int) or isinstance(count, bool) or count < 1:
+        raise ValueError('"count" must be a positive integer')
+    hard_mode = request.get('hard_mode', False)
+    if not isinstance(hard_mode, bool):
+        raise ValueError('"hard_mode" must be true or false')
+    return (hard_mode, history, count)
+
+_worker_game = None
+
+def _init_solver_worker(strategy:str, guess_pool:str, budget:float=None) -> None:
+    global _worker_game
+    _worker_game = Wordle(strategy=strategy, guess_pool=guess_pool)
+    _worker_game.budget = budget
+
+def _solve_states(states):
+    """Worker side: report on a list of (hard_mode, history, count) states."""
+    return ([_worker_game.report(*state) for state in states])
+
+def solve_many(requests, workers:int=None, strategy:str='minimax', guess_pool:str='answers', inline_limit:int=8):
+    """Remaining words and recommendations for many games at once, e.g. a whole leaderboard.
+
+    Each request is anything parse_game_request accepts. Games that reach the
+    same state are solved once, and the distinct states are spread over a
+    process pool, or solved in this process if there are at most inline_limit.
+    Returns one Wordle.report dict, or {'error': ...}, per request.
+    """
+    game = Wordle(strategy=strategy, guess_pool=guess_pool)
+    results = [None] * len(requests)
+    state_of = {}
+    states = []
+    for i, request in enumerate(requests):
+        try:
+            hard_mode, history, count = parse_game_request(request)
+            game.hard_mode = hard_mode
+            d = game.replay(history)
+        except ValueError as e:
+            results[i] = {'error': str(e)}
+            continue
+        constraints = d.hard_mode_constraints() if hard_mode else b''
+        key = (SearchCache.key(d.remaining, hard_mode, strategy, guess_pool, constraints), count)
+        if key not in state_of:
+            state_of[key] = len(states)
+            states.append((hard_mode, history, count))
+        results[i] = state_of[key]
+
+    metrics.count('solve_many_requests', len(requests))
+    metrics.count('solve_many_states', len(states))
+    if len(states) <= inline_limit or workers == 1:
+        reports = [game.report(*state) for state in states]
+    else:
+        workers = workers or os.cpu_count() or 1
+        size = max(1, -(-len(states) // (workers * 4)))
+        chunks = [states[i:i+size] for i in range(0, len(states), size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_solver_worker, initargs=(strategy, guess_pool)) as pool:
+            reports = [r for chunk in pool.map(_solve_states, chunks) for r in chunk]
+    return ([reports[r] if isinstance(r, int) else r for r in results])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Play Wordle, or get help solving it.')
+    parser.add_argument('--metrics', action='store_true', help='time the solver and print a report when done')
+    parser.add_argument('--profile', metavar='FILE', help='run under cProfile and write pstats to FILE')
+    parser.add_argument('--check-feedback', nargs='?', const=0, type=int, metavar='N',
+        help='check the vectorized feedback codes against compute_colors on N random pairs (default: all pairs) and exit')
+    parser.add_argument('--strategy', default='minimax', choices=STRATEGIES, help='how guesses are ranked (default: %(default)s)')
+    parser.add_argument('--guess-pool', default='answers', choices=Wordle.GUESS_POOLS,
+        help='candidate guesses: the answer list or all allowed guesses (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=None, help='seed for picking answers and for --tie-break random')
+    parser.add_argument('--tie-break', default='entropy', choices=Wordle.TIE_BREAKS,
+        help='order of equally good guesses after possible answers: a strategy score, alphabetical or random (default: %(default)s)')
+    parser.add_argument('--budget', type=float, metavar='MS', help='limit each recommendation search to MS milliseconds')
+    parser.add_argument('--length', type=int, default=5, help='word length (default: %(default)s)')
+    parser.add_argument('--answers', default=ANSWERS_FILE, metavar='FILE', help='answer word list (default: %(default)s)')
+    parser.add_argument('--guesses', default=GUESSES_FILE, metavar='FILE', help='allowed guesses word list (default: %(default)s)')
+    add_logging_args(parser)
+    args = parser.parse_args(argv)
+    configure_logging(args)
+
+    if args.check_feedback is not None:
+        patterns = load_pattern_table(args.answers, args.guesses, word_length=args.length)
+        n = check_feedback_codes(patterns.guesses, patterns.answers, args.check_feedback or None)
+        print (f'feedback_codes matches compute_colors on {n} pairs.')
+        return
+
+    metrics.enabled = args.metrics
+    game = Wordle(seed=args.seed, strategy=args.strategy, guess_pool=args.guess_pool, word_length=args.length,
+        answers_file=args.answers, guesses_file=args.guesses, tie_break=args.tie_break)
+    if args.budget is not None:
+        game.budget = args.budget / 1000
+    profiler = cProfile.Profile() if args.profile else None
+    try:
+        if profiler:
+            profiler.enable()
+        game.play()
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            print (f'Profile written to {args.profile}. View with "python -m pstats {args.profile}".')
+        if args.metrics:
+            print (metrics.report())
 
 if __name__ == "__main__":
-    main(open(sys.argv[1], encoding="utf-8") if len(sys.argv) > 1 else sys.stdin)
\ No newline at end of file
+    main()
\ No newline at end of file
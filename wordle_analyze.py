@@ -0,0 +1,113 @@
+"""Wordle dictionary analysis
+
+Sweep every allowed guess as an opener against every answer and keep the
+full bucket distribution, find the answers the solver needs the most guesses
+for, and list clusters of answers that differ in one letter, like
+ROVER/COVER/HOVER. Results are written to a compressed .npz file, one array
+per column, for later querying with numpy.
+"""
+import os
+import argparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import wordle
+import wordle_batch
+from wordle import np
+
+_patterns = None
+
+def _init_worker() -> None:
+    global _patterns
+    _patterns = wordle.load_pattern_table()
+
+def _sweep_rows(span):
+    start, stop = span
+    rows = np.arange(start, stop, dtype=np.intp)
+    return (start, _patterns.histograms(rows, np.arange(len(_patterns.answers), dtype=np.intp)))
+
+def opener_sweep(patterns:wordle.PatternTable, workers:int=None, chunk:int=256) -> dict:
+    """Bucket distribution of every guess as the first guess, with the scores of each strategy."""
+    counts = np.empty((len(patterns.guesses), patterns.ncodes), dtype=np.int32)
+    spans = [(start, min(start + chunk, len(patterns.guesses))) for start in range(0, len(patterns.guesses), chunk)]
+    progress = wordle.Progress(len(spans), 'Sweeping openers')
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for start, sub in pool.map(_sweep_rows, spans):
+            counts[start:start+len(sub)] = sub
+            progress.update()
+    total = len(patterns.answers)
+    return ({
+        'guesses': np.array(patterns.guesses, dtype=f'S{patterns.length}'),
+        'is_answer': np.arange(len(patterns.guesses)) < total,
+        'buckets': counts.astype(np.min_scalar_type(total)),
+        'worst': wordle.MinimaxStrategy().costs(counts, total).astype(np.int32),
+        'expected': wordle.ExpectedSizeStrategy().costs(counts, total),
+        'entropy': -wordle.EntropyStrategy().costs(counts, total),
+        'distinct': (counts > 0).sum(axis=1).astype(np.int32),
+    })
+
+def neighbour_clusters(words, min_size:int=4):
+    """Groups of at least min_size words that are the same but for one position, largest first.
+    Returns (pattern, words) pairs where the pattern has '_' at the differing position, e.g. '_OVER'."""
+    groups = defaultdict(list)
+    for w in words:
+        for i in range(len(w)):
+            groups[w[:i] + '_' + w[i+1:]].append(w)
+    clusters = [(p, ws) for p, ws in groups.items() if len(ws) >= min_size]
+    return (sorted(clusters, key=lambda c: (-len(c[1]), c[0])))
+
+def hardest_answers(result:dict, top:int):
+    """Answers with the longest guess paths from a wordle_batch.solve_all result, longest first."""
+    paths = result['paths']
+    return (sorted(paths, key=lambda a: (-len(paths[a]), a))[:top])
+
+def print_report(sweep:dict, solved:dict, clusters, top:int) -> None:
+    guesses = sweep['guesses'].astype(str)
+    for column, label, best_first in (('worst', 'largest bucket', 1), ('expected', 'expected remaining', 1),
+            ('entropy', 'bits', -1), ('distinct', 'distinct colorings', -1)):
+        order = np.argsort(best_first * sweep[column], kind='stable')[:top]
+        print ('Best openers by {}: {}'.format(label, ', '.join(f'{guesses[i]} ({sweep[column][i]:.4g})' for i in order)))
+    if solved is not None:
+        paths = solved['paths']
+        print ('Hardest answers for {} in {} mode: {}'.format(solved['strategy'], ('standard', 'hard')[solved['hard_mode']],
+            ', '.join(f'{a} ({len(paths[a])})' for a in hardest_answers(solved, top))))
+    print ('Largest one-letter neighbour clusters:')
+    for pattern, words in clusters[:top]:
+        print ('  {} {:>3}: {}'.format(pattern, len(words), ' '.join(words)))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Analyze openers, hardest answers and word clusters over the whole dictionary.')
+    parser.add_argument('--strategy', default='minimax', choices=wordle.STRATEGIES, help='strategy for the solve paths')
+    parser.add_argument('--guess-pool', default='answers', choices=wordle.Wordle.GUESS_POOLS,
+        help='candidate guesses: the answer list or all allowed guesses')
+    parser.add_argument('--hard', action='store_true', help='solve in hard mode')
+    parser.add_argument('--no-solve', action='store_true', help='skip solving every answer')
+    parser.add_argument('--min-cluster', type=int, default=4, help='smallest neighbour cluster to report (default: %(default)s)')
+    parser.add_argument('--top', type=int, default=10, help='entries shown per list (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--output', default='wordle-analysis.npz', help='results file (default: %(default)s)')
+    wordle.add_logging_args(parser)
+    args = parser.parse_args(argv)
+    wordle.configure_logging(args, wordle.logging.INFO)
+
+    patterns = wordle.load_pattern_table()
+    sweep = opener_sweep(patterns, args.workers)
+    solved = None
+    if not args.no_solve:
+        solved = wordle_batch.solve_all(patterns.answers, args.hard, workers=args.workers, strategy=args.strategy,
+            guess_pool=args.guess_pool)
+    clusters = neighbour_clusters(patterns.answers, args.min_cluster)
+    print_report(sweep, solved, clusters, args.top)
+
+    columns = dict(sweep)
+    columns['answers'] = np.array(patterns.answers, dtype=f'S{patterns.length}')
+    if solved is not None:
+        columns['solve_guesses'] = np.array([len(solved['paths'][a]) for a in patterns.answers], dtype=np.int8)
+        columns['solve_paths'] = np.array([' '.join(solved['paths'][a]) for a in patterns.answers], dtype=str)
+    columns['cluster_patterns'] = np.array([p for p, _ in clusters], dtype=f'S{patterns.length}')
+    columns['cluster_words'] = np.array([' '.join(ws) for _, ws in clusters], dtype=str)
+    np.savez_compressed(args.output, **columns)
+    wordle.log.info(f'Wrote {len(columns)} columns to {os.path.abspath(args.output)}')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Wordle batch solver
+
+Auto-solve every word in the answer list, headless and in parallel, and write
+the guess count statistics. Used to regenerate the README tables and to
+compare solver changes.
+"""
+import os
+import csv
+import json
+import time
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import wordle
+
+_game = None
+
+def _init_worker(hard_mode:bool, first_guess:str, cache_size:int, strategy:str, guess_pool:str, tie_break:str) -> None:
+    global _game
+    _game = wordle.Wordle(cache_size=cache_size, strategy=strategy, guess_pool=guess_pool, tie_break=tie_break)
+    _game.hard_mode = hard_mode
+    _game.FIRST_GUESS = first_guess
+
+def _solve_one(job):
+    answer, seed = job
+    # Seed per answer so the result does not depend on worker scheduling.
+    _game.rng.seed(f'{seed}:{answer}')
+    hits, misses = _game.cache.hits, _game.cache.misses
+    path = _game.solve(answer)
+    return (answer, path, _game.cache.hits - hits, _game.cache.misses - misses)
+
+def solve_all(answers, hard_mode:bool=False, first_guess:str=wordle.Wordle.FIRST_GUESS, seed:int=0, workers:int=None,
+        cache_size:int=4096, strategy:str='minimax', guess_pool:str='answers', tie_break:str='entropy') -> dict:
+    """Solve each answer in a process pool. Returns a summary with per-word guess paths."""
+    wordle.load_pattern_table()
+    start_time = time.perf_counter()
+    paths = {}
+    cache = Counter()
+    progress = wordle.Progress(len(answers), f'Solving ({strategy})')
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(hard_mode, first_guess, cache_size, strategy, guess_pool, tie_break)) as pool:
+        chunksize = max(1, len(answers) // ((workers or os.cpu_count() or 1) * 8))
+        for answer, path, hits, misses in pool.map(_solve_one, [(a, seed) for a in answers], chunksize=chunksize):
+            paths[answer] = path
+            cache.update(hits=hits, misses=misses)
+            progress.update()
+    wall_time = time.perf_counter() - start_time
+
+    histogram = Counter(len(p) for p in paths.values())
+    return ({
+        'strategy': strategy,
+        'guess_pool': guess_pool,
+        'tie_break': tie_break,
+        'hard_mode': hard_mode,
+        'first_guess': first_guess,
+        'seed': seed,
+        'words': len(answers),
+        'histogram': {n: histogram[n] for n in sorted(histogram)},
+        'average_guesses': sum(n * c for n, c in histogram.items()) / max(1, len(answers)),
+        'failures': sorted(a for a, p in paths.items() if len(p) > 6 or p[-1] != a),
+        'wall_time': wall_time,
+        'words_per_sec': len(answers) / wall_time if wall_time > 0 else 0.0,
+        'cache': dict(cache),
+        'paths': {a: paths[a] for a in answers},
+    })
+
+def print_summary(result:dict) -> None:
+    print ('{} mode, {} strategy, first guess {}, seed {}'.format(('Standard', 'Hard')[result['hard_mode']], result['strategy'],
+        result['first_guess'], result['seed']))
+    for n, c in result['histogram'].items():
+        print ('{:>3} guesses: {:>5}  {:6.1f}%'.format(n, c, c / result['words'] * 100.0))
+    print ('Total words: {}  Avg guesses: {:.3f}  Failures: {}'.format(result['words'], result['average_guesses'], len(result['failures'])))
+    print ('Wall time: {:.2f} sec  ({:.1f} words/sec)'.format(result['wall_time'], result['words_per_sec']))
+    print ('Search cache: {} hits, {} misses'.format(result['cache'].get('hits', 0), result['cache'].get('misses', 0)))
+
+def print_comparison(results) -> None:
+    counts = sorted({n for r in results for n in r['histogram']})
+    print ('{:>10} {}  {:>8} {:>8} {:>10}'.format('strategy', ' '.join(f'{n:>5}' for n in counts), 'avg', 'failures', 'words/sec'))
+    for r in results:
+        print ('{:>10} {}  {:>8.3f} {:>8} {:>10.1f}'.format(r['strategy'], ' '.join(f'{r["histogram"].get(n, 0):>5}' for n in counts),
+            r['average_guesses'], len(r['failures']), r['words_per_sec']))
+
+def write_csv(filename:str, results) -> None:
+    with open(filename, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['strategy', 'answer', 'guesses', 'path'])
+        for result in results:
+            for answer, path in result['paths'].items():
+                writer.writerow([result['strategy'], answer, len(path), ' '.join(path)])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Auto-solve the whole Wordle dictionary.')
+    parser.add_argument('--hard', action='store_true', help='play in hard mode')
+    parser.add_argument('--first', default=wordle.Wordle.FIRST_GUESS, type=str.upper, help='opening guess')
+    parser.add_argument('--strategy', nargs='+', default=['minimax'], choices=wordle.STRATEGIES,
+        help='how guesses are ranked, several strategies are compared')
+    parser.add_argument('--guess-pool', default='answers', choices=wordle.Wordle.GUESS_POOLS,
+        help='candidate guesses: the answer list or all allowed guesses')
+    parser.add_argument('--tie-break', default='entropy', choices=wordle.Wordle.TIE_BREAKS,
+        help='order of equally good guesses after possible answers (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for --tie-break random')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--cache-size', type=int, default=4096, help='search cache entries per worker (0 disables)')
+    parser.add_argument('--limit', type=int, default=None, help='only solve the first N answers')
+    parser.add_argument('--json', metavar='FILE', help='write summary and guess paths as JSON')
+    parser.add_argument('--csv', metavar='FILE', help='write per-word guess paths as CSV')
+    wordle.add_logging_args(parser)
+    args = parser.parse_args(argv)
+    wordle.configure_logging(args, wordle.logging.INFO)
+
+    patterns = wordle.load_pattern_table()
+    if args.first not in patterns.guess_index:
+        parser.error(f'--first {args.first} is not an allowed guess')
+    answers = patterns.answers[:args.limit]
+    results = []
+    for strategy in args.strategy:
+        results.append(solve_all(answers, args.hard, args.first, args.seed, args.workers, args.cache_size, strategy, args.guess_pool,
+            args.tie_break))
+        print_summary(results[-1])
+    if len(results) > 1:
+        print_comparison(results)
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results[0] if len(results) == 1 else results, file, indent=1)
+    if args.csv:
+        write_csv(args.csv, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Wordle solver benchmarks
+
+Times the solver's hot paths, headless and reproducibly, and compares the
+results with a stored baseline so a slowdown in any of them is flagged.
+
+    python wordle_bench.py                   # run and compare with the baseline
+    python wordle_bench.py --save-baseline   # run and store as the new baseline
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import platform
+import tracemalloc
+
+import wordle
+from wordle import np
+
+BASELINE_FILE = 'bench-baseline.json'
+
+def post_arise_worst(game:wordle.Wordle) -> wordle.Descriptor:
+    """The state after ARISE with the largest set of remaining answers."""
+    patterns = game.patterns
+    d = wordle.Descriptor(patterns)
+    codes = patterns.matrix[patterns.guess_index['ARISE'], d.remaining]
+    g = wordle.Guess()
+    g.guess = 'ARISE'
+    g.colors = wordle.code_to_colors(int(np.bincount(codes).argmax()))
+    game.apply_feedback(d, g)
+    return (d)
+
+def bench_cases(game:wordle.Wordle, seed:int, auto_words:int):
+    """(name, op, count) for each benchmark; op(i) runs one operation."""
+    rng = random.Random(seed)
+    patterns = game.patterns
+    pairs = [(rng.choice(patterns.guesses), rng.choice(patterns.answers)) for _ in range(1000)]
+    feedback = []
+    for guess, answer in pairs:
+        g = wordle.Guess()
+        g.guess = guess
+        g.colors = patterns.colors(guess, answer)
+        feedback.append(g)
+    start = wordle.Descriptor(patterns)
+    updated = []
+    for g in feedback:
+        d = start.copy()
+        d.update_descriptor(g)
+        updated.append(d)
+    worst = post_arise_worst(game)
+    subset = rng.sample(patterns.answers, auto_words)
+    scratch = wordle.Guess()
+
+    def compute_colors(i):
+        scratch.compute_colors(*pairs[i % len(pairs)])
+
+    def feedback_codes(i):
+        wordle.feedback_codes(pairs[i % len(pairs)][0], patterns.answer_letters)
+
+    def copy(i):
+        start.copy()
+
+    def update_descriptor(i):
+        start.copy().update_descriptor(feedback[i % len(feedback)])
+
+    def recalculate(i):
+        updated[i % len(updated)].copy().recalculate()
+
+    def filter_feedback(i):
+        g = feedback[i % len(feedback)]
+        start.copy().filter_feedback(g.guess, g.colors)
+
+    def best_guesses(i):
+        game.cache.clear()
+        game.best_guesses(worst)
+
+    def auto_run(i):
+        game.cache.clear()
+        for answer in subset:
+            game.rng.seed(f'{seed}:{answer}')
+            game.solve(answer)
+
+    return ([
+        ('compute_colors', compute_colors, 2000),
+        ('feedback_codes', feedback_codes, 200),
+        ('copy', copy, 2000),
+        ('update_descriptor', update_descriptor, 2000),
+        ('recalculate', recalculate, 500),
+        ('filter_feedback', filter_feedback, 500),
+        ('best_guesses', best_guesses, 20),
+        ('auto_run', auto_run, 3),
+    ])
+
+def peak_alloc(op, count:int) -> int:
+    """Most memory, in bytes, allocated at once while running op, numpy arrays included.
+    Measured in a separate pass, since tracing allocations slows the timed runs down."""
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        for i in range(count):
+            op(i)
+        return (tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+
+def run_case(op, count:int) -> dict:
+    op(0)
+    times = np.empty(count, dtype=np.int64)
+    for i in range(count):
+        start = time.perf_counter_ns()
+        op(i)
+        times[i] = time.perf_counter_ns() - start
+    return ({
+        'ops': count,
+        'ops_per_sec': count / (times.sum() / 1e9),
+        'p50_us': float(np.percentile(times, 50)) / 1e3,
+        'p99_us': float(np.percentile(times, 99)) / 1e3,
+        'peak_alloc_mb': peak_alloc(op, min(count, 3)) / 2 ** 20,
+    })
+
+def run_benchmarks(seed:int=0, auto_words:int=50, scale:float=1.0, only=None) -> dict:
+    game = wordle.Wordle(seed=seed)
+    game.use_tree = False
+    results = {}
+    for name, op, count in bench_cases(game, seed, auto_words):
+        if only and name not in only:
+            continue
+        results[name] = run_case(op, max(1, int(count * scale)))
+        wordle.log.info('%s: %.1f ops/sec', name, results[name]['ops_per_sec'])
+    return ({'seed': seed, 'auto_words': auto_words, 'python': platform.python_version(),
+        'numpy': np.__version__, 'machine': platform.machine(), 'results': results,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024})
+
+def compare(run:dict, baseline:dict, tolerance:float):
+    """Benchmarks whose throughput dropped more than tolerance below the baseline."""
+    regressions = []
+    for name, result in run['results'].items():
+        base = baseline['results'].get(name)
+        if base is not None and result['ops_per_sec'] < base['ops_per_sec'] * (1 - tolerance):
+            regressions.append(name)
+    return (regressions)
+
+def print_results(run:dict, baseline:dict=None) -> None:
+    print ('{:<20} {:>12} {:>10} {:>10} {:>10} {:>9}'.format('benchmark', 'ops/sec', 'p50 us', 'p99 us', 'alloc MB', 'vs base'))
+    for name, r in run['results'].items():
+        change = ''
+        if baseline and name in baseline['results']:
+            change = '{:+.1%}'.format(r['ops_per_sec'] / baseline['results'][name]['ops_per_sec'] - 1)
+        print ('{:<20} {:>12.1f} {:>10.1f} {:>10.1f} {:>10.1f} {:>9}'.format(name, r['ops_per_sec'], r['p50_us'], r['p99_us'],
+            r['peak_alloc_mb'], change))
+    print ('Peak RSS of the whole run: {:.1f} MB'.format(run['peak_rss_mb']))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the Wordle solver hot paths.')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the sampled inputs')
+    parser.add_argument('--auto-words', type=int, default=50, help='answers solved by the auto_run benchmark')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply the operation counts')
+    parser.add_argument('--only', nargs='+', metavar='NAME', help='run only these benchmarks')
+    parser.add_argument('--output', metavar='FILE', help='write the results as JSON')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='baseline file to compare with')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed throughput drop before flagging')
+    wordle.add_logging_args(parser)
+    args = parser.parse_args(argv)
+    wordle.configure_logging(args)
+
+    run = run_benchmarks(args.seed, args.auto_words, args.scale, args.only)
+    baseline = None
+    if not args.save_baseline:
+        try:
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+        except FileNotFoundError:
+            print (f'No baseline {args.baseline}, run with --save-baseline to create one.')
+    print_results(run, baseline)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(run, file, indent=1)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(run, file, indent=1)
+        print (f'Baseline saved to {args.baseline}')
+    elif baseline is not None:
+        regressions = compare(run, baseline, args.tolerance)
+        if regressions:
+            print ('Slower than baseline by more than {:.0%}: {}'.format(args.tolerance, ', '.join(regressions)))
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
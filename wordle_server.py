@@ -0,0 +1,162 @@
+"""Wordle solver service
+
+A long running asyncio server that keeps the word lists and pattern data in
+memory and answers solver requests, one JSON object per line:
+
+    {"id": 1, "guesses": ["ARISE", "CLOUT"], "colors": ["YBBBB", "BGGBG"], "hard_mode": false, "count": 5}
+
+Each request gets one JSON line back, echoing "id":
+
+    {"id": 1, "remaining": 3, "words": ["BLOAT", "FLOAT", "GLOAT"], "recommend": ["BADGE", ...], "score": 1,
+     "is_remaining": false, "exhaustive": true}
+
+or {"id": 1, "error": "..."}. Scoring runs in a pool of worker processes.
+Requests arriving together are batched, and identical game states in a batch
+are solved once.
+"""
+import os
+import json
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import wordle
+
+class Batcher:
+    """Collects states for a short delay and sends them to the pool in batches.
+
+    A state already waiting or in flight is not submitted again, its callers
+    share the first result.
+    """
+    def __init__(self, pool:ProcessPoolExecutor, workers:int, max_batch:int=64, max_delay:float=0.002):
+        self.pool = pool
+        self.workers = workers
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.pending = {}
+        self.queue = []
+        self.timer = None
+        self.batches = 0
+        self.deduplicated = 0
+
+    def submit(self, state) -> asyncio.Future:
+        future = self.pending.get(state)
+        if future is not None:
+            self.deduplicated += 1
+            return (future)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending[state] = future
+        self.queue.append(state)
+        if len(self.queue) >= self.max_batch:
+            self.flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.max_delay, self.flush)
+        return (future)
+
+    def flush(self) -> None:
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        batch, self.queue = self.queue, []
+        if len(batch) == 0:
+            return
+        self.batches += 1
+        size = -(-len(batch) // self.workers)
+        for start in range(0, len(batch), size):
+            asyncio.ensure_future(self._run(batch[start:start+size]))
+
+    async def _run(self, states) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.pool, wordle._solve_states, states)
+        except Exception as e:
+            results = [{'error': f'Solver failed: {e}'}] * len(states)
+        for state, result in zip(states, results):
+            future = self.pending.pop(state)
+            if not future.done():
+                future.set_result(result)
+
+class SolverServer:
+    def __init__(self, workers:int=None, strategy:str='minimax', guess_pool:str='answers', budget:float=None):
+        # Build or map the pattern cache once, before the workers need it.
+        wordle.load_pattern_table()
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=wordle._init_solver_worker,
+            initargs=(strategy, guess_pool, budget))
+        self.batcher = Batcher(self.pool, self.workers)
+
+    async def handle_line(self, line:bytes) -> dict:
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f'Invalid JSON: {e}')
+            if isinstance(request, dict):
+                request_id = request.get('id')
+            result = await self.batcher.submit(wordle.parse_game_request(request))
+        except ValueError as e:
+            result = {'error': str(e)}
+        except Exception as e:
+            # E.g. RecursionError from deeply nested JSON: answer the line, keep the connection.
+            wordle.log.exception('Failed to handle request')
+            result = {'error': f'{type(e).__name__}: {e}'}
+        return (dict(result, id=request_id) if request_id is not None else result)
+
+    async def handle_client(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter) -> None:
+        tasks = set()
+
+        async def respond(line):
+            response = await self.handle_line(line)
+            writer.write(json.dumps(response).encode() + b'\n')
+            await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(respond(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host:str, port:int) -> None:
+        server = await asyncio.start_server(self.handle_client, host, port)
+        wordle.log.warning('Serving on %s with %d workers', ', '.join(str(s.getsockname()) for s in server.sockets), self.workers)
+        async with server:
+            await server.serve_forever()
+
+    def close(self) -> None:
+        self.pool.shutdown()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve Wordle solver requests over line-oriented JSON.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--strategy', default='minimax', choices=wordle.STRATEGIES, help='how guesses are ranked')
+    parser.add_argument('--guess-pool', default='answers', choices=wordle.Wordle.GUESS_POOLS,
+        help='candidate guesses: the answer list or all allowed guesses')
+    parser.add_argument('--budget', type=float, metavar='MS', help='answer with the best guesses found within MS milliseconds')
+    wordle.add_logging_args(parser)
+    args = parser.parse_args(argv)
+    wordle.configure_logging(args)
+
+    server = SolverServer(args.workers, args.strategy, args.guess_pool, None if args.budget is None else args.budget / 1000)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+if __name__ == "__main__":
+    main()
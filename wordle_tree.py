@@ -0,0 +1,66 @@
+"""Wordle opening book builder
+
+Follow the solver from the first guess through every possible feedback and
+record its recommendation for each state it reaches. The game and the batch
+solver then answer from the saved tree instead of searching.
+"""
+import time
+import argparse
+
+import wordle
+from wordle import np
+
+def build_node(game:wordle.Wordle, d:wordle.Descriptor, recommendation, progress:wordle.Progress) -> dict:
+    progress.update()
+    score, recs, is_remaining = recommendation
+    node = {'m': score, 'r': is_remaining, 'g': recs[:5], 'c': {}}
+    row = game.patterns.guess_index[recs[0]]
+    codes = game.patterns.matrix[row, d.remaining]
+    for code in np.unique(codes):
+        colors = wordle.code_to_colors(int(code), game.word_length)
+        if colors == 'G' * len(colors):
+            continue
+        child = d.copy()
+        g = wordle.Guess(game.word_length)
+        g.guess = recs[0]
+        g.colors = colors
+        game.apply_feedback(child, g)
+        node['c'][colors] = build_node(game, child, game.best_guesses(child, len(game.patterns.guesses)), progress)
+    return (node)
+
+def build_tree(game:wordle.Wordle, first_guess:str) -> wordle.DecisionTree:
+    d = wordle.Descriptor(game.patterns)
+    rows = np.array([game.patterns.guess_index[first_guess]])
+    cost = game.strategy.row_costs(game.patterns, rows, d.remaining)[0]
+    progress = wordle.Progress(0, 'Tree nodes built')
+    root = build_node(game, d, (game.strategy.value(cost), [first_guess], first_guess in game.patterns.answer_index), progress)
+    return (wordle.DecisionTree(root, game.patterns.digest, game.hard_mode, game.strategy.name, game.guess_pool, game.tie_break))
+
+def count_nodes(node:dict) -> int:
+    return (1 + sum(count_nodes(c) for c in node['c'].values()))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the Wordle solver opening book.')
+    parser.add_argument('--hard', action='store_true', help='build the hard mode tree')
+    parser.add_argument('--first', default=wordle.Wordle.FIRST_GUESS, type=str.upper, help='opening guess')
+    parser.add_argument('--strategy', default='minimax', choices=wordle.STRATEGIES, help='how guesses are ranked')
+    parser.add_argument('--guess-pool', default='answers', choices=wordle.Wordle.GUESS_POOLS,
+        help='candidate guesses: the answer list or all allowed guesses')
+    parser.add_argument('--tie-break', default='entropy', choices=wordle.Wordle.TIE_BREAKS, help='order of equally good guesses')
+    parser.add_argument('--output', metavar='FILE', help='tree file (default: the file the game loads)')
+    wordle.add_logging_args(parser)
+    args = parser.parse_args(argv)
+    wordle.configure_logging(args, wordle.logging.INFO)
+
+    game = wordle.Wordle(strategy=args.strategy, guess_pool=args.guess_pool, tie_break=args.tie_break)
+    game.hard_mode = args.hard
+    if args.first not in game.patterns.guess_index:
+        parser.error(f'--first {args.first} is not an allowed guess')
+    start_time = time.perf_counter()
+    tree = build_tree(game, args.first)
+    filename = args.output or wordle.tree_filename(args.hard, args.strategy, args.guess_pool, args.tie_break)
+    tree.save(filename)
+    print ('Built {} nodes in {:.2f} sec. Saved to {}'.format(count_nodes(tree.root), time.perf_counter() - start_time, filename))
+
+if __name__ == "__main__":
+    main()